@@ -136,31 +136,41 @@ class IndividualTaxCalculator:
             'taux_marginal': 0,
             'taux_moyen': 0,
             'taux_effectif': 0,
-            'detail_tranches': [],
+            'detail_tranches': {
+                'tranche': np.array([], dtype=object),
+                'taux': np.array([]),
+                'montant_imposable': np.array([]),
+                'impot': np.array([])
+            },
             'revenu_apres_impot': 0
         }
     
-    def _calculer_detail_tranches(self, quotient: float) -> List[Dict]:
-        """Calcule le détail par tranche d'imposition."""
-        detail = []
-        revenu_restant = quotient
+    def _calculer_detail_tranches(self, quotient: float) -> Dict[str, np.ndarray]:
+        """
+        Calcule le détail par tranche d'imposition.
         
-        for _, tranche in self.bareme.bareme.iterrows():
-            if revenu_restant <= 0:
-                break
-            
-            montant_tranche = min(revenu_restant, tranche['max'] - tranche['min'])
-            if montant_tranche > 0:
-                impot_tranche = montant_tranche * tranche['taux']
-                detail.append({
-                    'tranche': f"{tranche['min']:.0f} - {tranche['max']:.0f}",
-                    'taux': tranche['taux'],
-                    'montant_imposable': montant_tranche,
-                    'impot': impot_tranche
-                })
-                revenu_restant -= montant_tranche
+        Le détail est stocké par colonnes (un tableau NumPy par champ) afin que
+        les agrégations, par exemple detail['impot'].sum(), soient vectorisées.
+        Seules les tranches effectivement entamées sont conservées.
+        """
+        mins = self.bareme._mins
+        maxs = self.bareme._maxs
+        taux = self.bareme._taux
         
-        return detail
+        # Montant imposable dans chaque tranche, comme dans BaremeFiscal.calculer_impot :
+        # soustraction forcée en float64 (un quotient scalaire ne suffit pas à
+        # promouvoir les bornes float32 du barème)
+        montants = np.clip(np.subtract(quotient, self.bareme._debuts, dtype=float),
+                           0, self.bareme._widths)
+        
+        masque = montants > 0
+        return {
+            'tranche': np.array([f"{bas:.0f} - {haut:.0f}"
+                                 for bas, haut in zip(mins[masque], maxs[masque])], dtype=object),
+            'taux': taux[masque],
+            'montant_imposable': montants[masque],
+            'impot': montants[masque] * taux[masque]
+        }
     
     def generer_courbe_taux(self, revenu_max: float = 200000, 
                            parts: float = 1.0, nb_points: int = 1000) -> pd.DataFrame:
@@ -176,32 +186,7 @@ class IndividualTaxCalculator:
             DataFrame avec revenu, taux_marginal, taux_moyen, taux_effectif
         """
         revenus = np.linspace(0, revenu_max, nb_points)
-        resultats = []
-        
-        for revenu in revenus:
-            if revenu <= 0:
-                resultats.append({
-                    'revenu': revenu,
-                    'taux_marginal': 0,
-                    'taux_moyen': 0,
-                    'taux_effectif': 0
-                })
-            else:
-                quotient = revenu / parts
-                taux_marginal = self.bareme.get_taux_marginal(quotient)
-                taux_moyen = self.bareme.get_taux_moyen(quotient)
-                
-                impot_net = self.bareme.calculer_impot_net(revenu, parts)
-                taux_effectif = impot_net / revenu if revenu > 0 else 0
-                
-                resultats.append({
-                    'revenu': revenu,
-                    'taux_marginal': taux_marginal,
-                    'taux_moyen': taux_moyen,
-                    'taux_effectif': taux_effectif
-                })
-        
-        return pd.DataFrame(resultats)
+        return pd.DataFrame(self.bareme.calculer_courbe_taux(revenus, parts))
     
     def modifier_barème(self, modifications: List[Dict]) -> BaremeFiscal:
         """
@@ -215,7 +200,7 @@ class IndividualTaxCalculator:
         """
         bareme_data = []
         
-        for _, tranche in self.bareme.bareme.iterrows():
+        for tranche in self.bareme.tranches:
             # Chercher une modification pour cette tranche
             taux_modifie = tranche['taux']
             for mod in modifications:
@@ -112,7 +112,7 @@ class MarkovPopulationModel:
             params: Paramètres du modèle
             
         Returns:
-            Matrice de générateur Q
+            Matrice de générateur Q (le même objet que self.Q, sans copie)
         """
         Q = np.zeros((self.n_tranches, self.n_tranches))
         
@@ -233,13 +233,9 @@ class MarkovPopulationModel:
         # Revenu moyen global
         revenu_moyen_global = np.sum(revenus_moyens.reshape(-1, 1) * repartition, axis=0)
         
-        # Recettes fiscales
-        recettes = np.zeros(n_points)
-        for i in range(n_points):
-            for j in range(self.n_tranches):
-                revenu_tranche = revenus_moyens[j]
-                impot_tranche = self.bareme.calculer_impot_net(revenu_tranche)
-                recettes[i] += population[j, i] * impot_tranche
+        # Recettes fiscales : impôt par tranche pondéré par les effectifs
+        impots_tranches = self.bareme.calculer_impot_net_vec(revenus_moyens)
+        recettes = impots_tranches @ population
         
         # Mobilité ascendante
         mobilite_ascendante = np.zeros(n_points)
@@ -290,7 +286,8 @@ class MarkovPopulationModel:
     
     def simuler_choc_fiscal(self, distribution_initiale: np.ndarray,
                            t_span: Tuple[float, float], params_base: Dict,
-                           delta_tau: float, t_choc: float = 0.5) -> Dict:
+                           delta_tau: float, t_choc: float = 0.5,
+                           resultats_base: Optional[Dict] = None) -> Dict:
         """
         Simule l'effet d'un choc fiscal.
         
@@ -300,12 +297,14 @@ class MarkovPopulationModel:
             params_base: Paramètres de base
             delta_tau: Augmentation du taux marginal
             t_choc: Moment du choc (proportion de t_span)
+            resultats_base: Simulation de base déjà calculée (évite de la relancer)
             
         Returns:
             Résultats avec et sans choc
         """
         # Simulation de base
-        resultats_base = self.simuler(distribution_initiale, t_span, params_base)
+        if resultats_base is None:
+            resultats_base = self.simuler(distribution_initiale, t_span, params_base)
         
         # Modification du barème pour le choc
         bareme_choc = self._creer_bareme_choc(delta_tau)
@@ -328,7 +327,7 @@ class MarkovPopulationModel:
         """Crée un barème avec choc fiscal."""
         bareme_data = []
         
-        for _, tranche in self.bareme.bareme.iterrows():
+        for tranche in self.bareme.tranches:
             taux = tranche['taux']
             # Applique le choc à la tranche la plus haute
             if tranche['taux'] == 0.45:  # Tranche la plus haute
@@ -344,7 +343,8 @@ class MarkovPopulationModel:
     
     def simuler_redistribution(self, distribution_initiale: np.ndarray,
                               t_span: Tuple[float, float], params_base: Dict,
-                              rho: float, k: int) -> Dict:
+                              rho: float, k: int,
+                              resultats_base: Optional[Dict] = None) -> Dict:
         """
         Simule une politique de redistribution.
         
@@ -354,12 +354,14 @@ class MarkovPopulationModel:
             params_base: Paramètres de base
             rho: Taux de redistribution
             k: Nombre de tranches basses concernées
+            resultats_base: Simulation de base déjà calculée (évite de la relancer)
             
         Returns:
             Résultats avec redistribution
         """
         # Simulation de base
-        resultats_base = self.simuler(distribution_initiale, t_span, params_base)
+        if resultats_base is None:
+            resultats_base = self.simuler(distribution_initiale, t_span, params_base)
         
         # Modification des paramètres pour la redistribution
         params_redist = params_base.copy()
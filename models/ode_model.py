@@ -98,49 +98,46 @@ class ODEPopulationModel:
         else:
             return 0.0
     
-    def _systeme_edo(self, t: float, y: np.ndarray, params: Dict) -> np.ndarray:
+    def _construire_matrice_systeme(self, params: Dict) -> np.ndarray:
         """
-        Définit le système d'équations différentielles.
+        Construit la matrice A du système linéaire dy/dt = A y.
+        
+        Les taux de croissance et de mobilité ne dépendent que des paramètres
+        et du barème : la matrice est donc calculée une seule fois par simulation
+        au lieu d'être recalculée à chaque évaluation du second membre.
         
         Args:
-            t: Temps
-            y: Vecteur d'état [N_1, N_2, ..., N_n]
             params: Paramètres du modèle
             
         Returns:
-            Dérivées dy/dt
+            Matrice A de taille (n_tranches, n_tranches)
         """
         g = params['g']  # Croissance économique
         pi = params['pi']  # Inflation
         alpha = params['alpha']  # Mobilité ascendante
         beta = params['beta']  # Mobilité descendante
         
-        dydt = np.zeros_like(y)
+        # Revenu moyen de chaque tranche
+        revenus = [np.mean(tranche) for tranche in self.tranches]
+        
+        # Croissance naturelle des tranches
+        croissance = np.array([self._calculer_taux_croissance(revenu, g, pi)
+                               for revenu in revenus])
         
+        # Mobilité de la tranche i vers la tranche j
+        mobilite = np.zeros((self.n_tranches, self.n_tranches))
         for i in range(self.n_tranches):
-            # Revenu moyen de la tranche i
-            revenu_i = np.mean(self.tranches[i])
-            
-            # Croissance naturelle de la tranche
-            taux_croissance = self._calculer_taux_croissance(revenu_i, g, pi)
-            dydt[i] += taux_croissance * y[i]
-            
-            # Mobilité vers les autres tranches
             for j in range(self.n_tranches):
                 if i != j:
-                    revenu_j = np.mean(self.tranches[j])
-                    mobilite = self._calculer_mobilite(revenu_i, revenu_j, alpha, beta)
-                    
-                    # Flux sortant de i vers j
-                    dydt[i] -= mobilite * y[i]
-                    # Flux entrant de j vers i
-                    dydt[j] += mobilite * y[i]
-        
-        return dydt
+                    mobilite[i, j] = self._calculer_mobilite(revenus[i], revenus[j], alpha, beta)
+        
+        # Flux sortants sur la diagonale, flux entrants de i vers j en A[j, i]
+        return np.diag(croissance - mobilite.sum(axis=1)) + mobilite.T
     
     def simuler(self, conditions_initiales: np.ndarray, 
                 t_span: Tuple[float, float], params: Dict,
-                t_eval: Optional[np.ndarray] = None) -> Dict:
+                t_eval: Optional[np.ndarray] = None,
+                rtol: float = 1e-6, atol: float = 1e-8) -> Dict:
         """
         Simule l'évolution de la population.
         
@@ -149,6 +146,8 @@ class ODEPopulationModel:
             t_span: Intervalle de temps (t0, tf)
             params: Paramètres du modèle
             t_eval: Points de temps pour l'évaluation
+            rtol: Tolérance relative du solveur
+            atol: Tolérance absolue du solveur
             
         Returns:
             Résultats de la simulation
@@ -156,15 +155,18 @@ class ODEPopulationModel:
         if t_eval is None:
             t_eval = np.linspace(t_span[0], t_span[1], 100)
         
+        # Le système est linéaire : la matrice est construite une seule fois
+        A = self._construire_matrice_systeme(params)
+        
         # Résolution du système EDO
         sol = solve_ivp(
-            fun=lambda t, y: self._systeme_edo(t, y, params),
+            fun=lambda t, y: A @ y,
             t_span=t_span,
             y0=conditions_initiales,
             t_eval=t_eval,
             method='RK45',
-            rtol=1e-6,
-            atol=1e-8
+            rtol=rtol,
+            atol=atol
         )
         
         if not sol.success:
@@ -199,13 +201,9 @@ class ODEPopulationModel:
         # Revenu moyen global
         revenu_moyen_global = np.sum(revenus_moyens.reshape(-1, 1) * repartition, axis=0)
         
-        # Recettes fiscales
-        recettes = np.zeros(n_points)
-        for i in range(n_points):
-            for j in range(n_tranches):
-                revenu_tranche = revenus_moyens[j]
-                impot_tranche = self.bareme.calculer_impot_net(revenu_tranche)
-                recettes[i] += population[j, i] * impot_tranche
+        # Recettes fiscales : impôt par tranche pondéré par les effectifs
+        impots_tranches = self.bareme.calculer_impot_net_vec(revenus_moyens)
+        recettes = impots_tranches @ population
         
         # Mobilité ascendante
         mobilite_ascendante = np.zeros(n_points)
@@ -254,7 +252,8 @@ class ODEPopulationModel:
     
     def simuler_choc_fiscal(self, conditions_initiales: np.ndarray,
                            t_span: Tuple[float, float], params_base: Dict,
-                           delta_tau: float, t_choc: float = 0.5) -> Dict:
+                           delta_tau: float, t_choc: float = 0.5,
+                           resultats_base: Optional[Dict] = None) -> Dict:
         """
         Simule l'effet d'un choc fiscal.
         
@@ -264,12 +263,14 @@ class ODEPopulationModel:
             params_base: Paramètres de base
             delta_tau: Augmentation du taux marginal
             t_choc: Moment du choc (proportion de t_span)
+            resultats_base: Simulation de base déjà calculée (évite de la relancer)
             
         Returns:
             Résultats avec et sans choc
         """
         # Simulation de base
-        resultats_base = self.simuler(conditions_initiales, t_span, params_base)
+        if resultats_base is None:
+            resultats_base = self.simuler(conditions_initiales, t_span, params_base)
         
         # Modification du barème pour le choc
         bareme_choc = self._creer_bareme_choc(delta_tau)
@@ -292,7 +293,7 @@ class ODEPopulationModel:
         """Crée un barème avec choc fiscal."""
         bareme_data = []
         
-        for _, tranche in self.bareme.bareme.iterrows():
+        for tranche in self.bareme.tranches:
             taux = tranche['taux']
             # Applique le choc à la tranche la plus haute
             if tranche['taux'] == 0.45:  # Tranche la plus haute
@@ -308,7 +309,8 @@ class ODEPopulationModel:
     
     def simuler_redistribution(self, conditions_initiales: np.ndarray,
                               t_span: Tuple[float, float], params_base: Dict,
-                              rho: float, k: int) -> Dict:
+                              rho: float, k: int,
+                              resultats_base: Optional[Dict] = None) -> Dict:
         """
         Simule une politique de redistribution.
         
@@ -318,12 +320,14 @@ class ODEPopulationModel:
             params_base: Paramètres de base
             rho: Taux de redistribution
             k: Nombre de tranches basses concernées
+            resultats_base: Simulation de base déjà calculée (évite de la relancer)
             
         Returns:
             Résultats avec redistribution
         """
         # Simulation de base
-        resultats_base = self.simuler(conditions_initiales, t_span, params_base)
+        if resultats_base is None:
+            resultats_base = self.simuler(conditions_initiales, t_span, params_base)
         
         # Modification des paramètres pour la redistribution
         params_redist = params_base.copy()
@@ -2,7 +2,7 @@ from shiny import ui, render, reactive
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-from server.utils import save_matplotlib_figure
+from server.utils import save_matplotlib_figure, debounce
 from utils.bareme import get_bareme_2024, BaremeFiscal
 
 def comparator_server(input, output, session, calculator):
@@ -20,14 +20,17 @@ def comparator_server(input, output, session, calculator):
         ui.update_slider("taux_tranche_4", value=41)
         ui.update_slider("taux_tranche_5", value=45)
     
+    @debounce(0.25)
+    def scenario():
+        """Taux des tranches 2 à 5, regroupés et propagés une fois les sliders stabilisés."""
+        return (input.taux_tranche_2(), input.taux_tranche_3(),
+                input.taux_tranche_4(), input.taux_tranche_5())
+    
     @reactive.calc
     def get_bareme_modifie():
-        """Crée le barème modifié à partir des inputs."""
+        """Crée le barème modifié à partir du scénario."""
         # Récupérer les taux modifiés
-        t2 = input.taux_tranche_2() / 100
-        t3 = input.taux_tranche_3() / 100
-        t4 = input.taux_tranche_4() / 100
-        t5 = input.taux_tranche_5() / 100
+        t2, t3, t4, t5 = (taux / 100 for taux in scenario())
         
         # Créer la liste des modifications
         modifications = [
@@ -40,6 +43,20 @@ def comparator_server(input, output, session, calculator):
         # Utiliser la méthode de calculator pour modifier le barème
         # Note: calculator.bareme est le barème par défaut (2024)
         return calculator.modifier_barème(modifications)
+    
+    @reactive.calc
+    def recettes():
+        """Recettes (référence, modifiée) sur une population simplifiée (partagées par le texte et le graphique)."""
+        bareme_mod = get_bareme_modifie()
+        
+        # Population simplifiée pour estimation
+        # On suppose une distribution uniforme pour simplifier, ou quelques points clés
+        population_sample = np.array([15000, 25000, 40000, 60000, 100000, 200000])
+        weights = np.array([20, 30, 25, 15, 8, 2]) # Poids relatifs
+        
+        recettes_ref = bareme_ref.calculer_impot_net_vec(population_sample) @ weights
+        recettes_mod = bareme_mod.calculer_impot_net_vec(population_sample) @ weights
+        return recettes_ref, recettes_mod
 
     @output
     @render.image
@@ -50,17 +67,12 @@ def comparator_server(input, output, session, calculator):
         fig, ax = plt.subplots(figsize=(8, 5))
         
         revenus = np.linspace(0, 200000, 100)
-        taux_ref = []
-        taux_mod = []
         
-        for r in revenus:
-            # Taux effectif référence
-            impot_ref = bareme_ref.calculer_impot_net(r)
-            taux_ref.append(impot_ref / r * 100 if r > 0 else 0)
-            
-            # Taux effectif modifié
-            impot_mod = bareme_mod.calculer_impot_net(r)
-            taux_mod.append(impot_mod / r * 100 if r > 0 else 0)
+        # Taux effectifs (%) calculés sur toute la grille, nuls pour un revenu nul
+        taux_ref = np.divide(bareme_ref.calculer_impot_net_vec(revenus) * 100, revenus,
+                             out=np.zeros_like(revenus), where=revenus > 0)
+        taux_mod = np.divide(bareme_mod.calculer_impot_net_vec(revenus) * 100, revenus,
+                             out=np.zeros_like(revenus), where=revenus > 0)
             
         ax.plot(revenus, taux_ref, 'b-', linewidth=2, label='Actuel (2024)')
         ax.plot(revenus, taux_mod, 'r--', linewidth=2, label='Modifié')
@@ -83,15 +95,8 @@ def comparator_server(input, output, session, calculator):
         fig, ax = plt.subplots(figsize=(8, 5))
         
         revenus = np.linspace(0, 200000, 100)
-        dispo_ref = []
-        dispo_mod = []
-        
-        for r in revenus:
-            impot_ref = bareme_ref.calculer_impot_net(r)
-            dispo_ref.append(r - impot_ref)
-            
-            impot_mod = bareme_mod.calculer_impot_net(r)
-            dispo_mod.append(r - impot_mod)
+        dispo_ref = revenus - bareme_ref.calculer_impot_net_vec(revenus)
+        dispo_mod = revenus - bareme_mod.calculer_impot_net_vec(revenus)
             
         ax.plot(revenus, dispo_ref, 'b-', linewidth=2, label='Actuel (2024)')
         ax.plot(revenus, dispo_mod, 'r--', linewidth=2, label='Modifié')
@@ -109,19 +114,7 @@ def comparator_server(input, output, session, calculator):
     @render.text
     def comparator_recettes_text():
         """Texte résumant l'impact sur les recettes."""
-        bareme_mod = get_bareme_modifie()
-        
-        # Population simplifiée pour estimation
-        # On suppose une distribution uniforme pour simplifier, ou quelques points clés
-        population_sample = [15000, 25000, 40000, 60000, 100000, 200000]
-        weights = [20, 30, 25, 15, 8, 2] # Poids relatifs
-        
-        recettes_ref = 0
-        recettes_mod = 0
-        
-        for r, w in zip(population_sample, weights):
-            recettes_ref += bareme_ref.calculer_impot_net(r) * w
-            recettes_mod += bareme_mod.calculer_impot_net(r) * w
+        recettes_ref, recettes_mod = recettes()
             
         diff = recettes_mod - recettes_ref
         pct = (diff / recettes_ref * 100) if recettes_ref > 0 else 0
@@ -133,18 +126,7 @@ def comparator_server(input, output, session, calculator):
     @render.image
     def plot_comparator_recettes():
         """Graphique de l'impact sur les recettes."""
-        bareme_mod = get_bareme_modifie()
-        
-        # Même échantillon
-        population_sample = [15000, 25000, 40000, 60000, 100000, 200000]
-        weights = [20, 30, 25, 15, 8, 2]
-        
-        recettes_ref = 0
-        recettes_mod = 0
-        
-        for r, w in zip(population_sample, weights):
-            recettes_ref += bareme_ref.calculer_impot_net(r) * w
-            recettes_mod += bareme_mod.calculer_impot_net(r) * w
+        recettes_ref, recettes_mod = recettes()
             
         fig, ax = plt.subplots(figsize=(8, 5))
         
@@ -2,7 +2,7 @@ from shiny import ui, render, reactive
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-from server.utils import save_matplotlib_figure
+from server.utils import save_matplotlib_figure, debounce
 
 def individual_server(input, output, session, calculator):
     """Logique serveur pour le calculateur individuel."""
@@ -27,12 +27,16 @@ def individual_server(input, output, session, calculator):
             ui.update_slider("revenu", value=200000)
             ui.update_slider("parts", value=1.0)
     
+    @debounce(0.25)
+    def situation():
+        """Revenu et parts, propagés une fois les sliders stabilisés."""
+        return input.revenu(), input.parts()
+    
     @output
     @render.text
     def resultat_impot():
         """Affiche le résultat du calcul d'impôt."""
-        revenu = input.revenu()
-        parts = input.parts()
+        revenu, parts = situation()
         decote = input.decote()
         plafonnement = input.plafonnement()
         
@@ -57,19 +61,18 @@ def individual_server(input, output, session, calculator):
     @render.table
     def detail_tranches():
         """Affiche le détail par tranches."""
-        revenu = input.revenu()
-        parts = input.parts()
+        revenu, parts = situation()
         
         try:
             result = calculator.calculer_impot_complet(revenu, parts)
             detail = result['detail_tranches']
             
-            if detail:
+            if len(detail['impot']) > 0:
                 df = pd.DataFrame({
-                    'Tranche': [t['tranche'] for t in detail],
-                    'Taux': [f"{t['taux']*100:.1f}%" for t in detail],
-                    'Base imposable': [f"{t['montant_imposable']:,.0f}€" for t in detail],
-                    'Impôt tranche': [f"{t['impot']:,.0f}€" for t in detail]
+                    'Tranche': detail['tranche'],
+                    'Taux': [f"{t*100:.1f}%" for t in detail['taux']],
+                    'Base imposable': [f"{m:,.0f}€" for m in detail['montant_imposable']],
+                    'Impôt tranche': [f"{i:,.0f}€" for i in detail['impot']]
                 })
             else:
                 df = pd.DataFrame({
@@ -120,55 +123,24 @@ def individual_server(input, output, session, calculator):
     @render.image
     def plot_montants():
         """Graphique des montants d'impôt avec des lignes."""
-        revenu = input.revenu()
-        parts = input.parts()
-        
-        # Calcul simple de l'impôt
-        quotient = revenu / parts
-        impot_brut = 0
-        
-        if quotient > 177106:
-            impot_brut += (quotient - 177106) * 0.45
-            quotient = 177106
-        if quotient > 82341:
-            impot_brut += (quotient - 82341) * 0.41
-            quotient = 82341
-        if quotient > 28797:
-            impot_brut += (quotient - 28797) * 0.30
-            quotient = 28797
-        if quotient > 11294:
-            impot_brut += (quotient - 11294) * 0.11
-        
-        impot_brut *= parts
+        revenu, parts = situation()
+        
+        # Impôt de la situation courante : simple lecture dans la table précalculée
+        # (les sliders restent sur la grille revenu x parts de precompute_table)
+        impot_actuel = calculator.bareme.impot_net_precalcule(revenu, parts)
         
         # Graphique matplotlib
         fig, ax = plt.subplots(figsize=(8, 5))
         
         # Simulation de l'évolution de l'impôt selon le revenu
         revenus = np.linspace(0, revenu * 2, 50)
-        impots = []
-        
-        for r in revenus:
-            q = r / parts
-            imp = 0
-            if q > 177106:
-                imp += (q - 177106) * 0.45
-                q = 177106
-            if q > 82341:
-                imp += (q - 82341) * 0.41
-                q = 82341
-            if q > 28797:
-                imp += (q - 28797) * 0.30
-                q = 28797
-            if q > 11294:
-                imp += (q - 11294) * 0.11
-            impots.append(imp * parts)
+        impots = calculator.bareme.calculer_impot_net_vec(revenus, parts)
         
         # Tracer la ligne
         ax.plot(revenus, impots, 'g-', linewidth=3, label='Impôt selon le revenu')
         
         # Marquer le point actuel
-        ax.plot(revenu, impot_brut, 'ro', markersize=12, label='Votre situation')
+        ax.plot(revenu, impot_actuel, 'ro', markersize=12, label='Votre situation')
         
         ax.set_title("Évolution de l'impôt selon le revenu", fontsize=14, fontweight='bold')
         ax.set_xlabel("Revenu (€)", fontsize=12)
@@ -1,3 +1,4 @@
+from pathlib import Path
 from shiny import App, ui
 from ui.layout import create_ui
 from server.individual import individual_server
@@ -24,5 +25,5 @@ def server(input, output, session):
     simulation_server(input, output, session, ode_model, markov_model)
     comparator_server(input, output, session, calculator)
 
-# Création de l'application
-app = App(create_ui(), server)
+# Création de l'application (www/ contient les fichiers statiques, dont app.css)
+app = App(create_ui(), server, static_assets=Path(__file__).parent.parent / "www")
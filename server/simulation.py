@@ -5,7 +5,35 @@ import numpy as np
 import plotly.graph_objects as go
 from utils.visualization import create_population_plots
 import matplotlib.pyplot as plt
-from .utils import save_matplotlib_figure
+from .utils import save_matplotlib_figure, update_figure_widget
+
+# Population initiale par tranche (float32 : précision largement suffisante)
+_INITIAL_POP = np.array([100000, 200000, 300000, 150000, 50000], dtype=np.float32)
+
+# Figures affichées par les sorties de l'onglet simulation
+_CLES_FIGURES = ('aires', 'gini', 'mobilite', 'recettes')
+
+
+def _figures_simulation(results, modele):
+    """
+    Construit les figures des sorties à partir des résultats de simulation.
+    
+    Si la simulation a échoué (clé 'erreur', sans séries temporelles), chaque
+    sortie reçoit une figure vide dont le titre affiche l'erreur, au lieu de
+    lever une exception dans l'effet de mise à jour, ce qui fermerait la session.
+    
+    Args:
+        results: Résultats de simulation
+        modele: Modèle utilisé ('ode' ou 'markov')
+        
+    Returns:
+        Dictionnaire cle -> figure Plotly
+    """
+    if 'erreur' in results:
+        titre = f"Erreur de simulation : {results['erreur']}"
+        return {cle: go.Figure(layout=dict(title=dict(text=titre))) for cle in _CLES_FIGURES}
+    
+    return create_population_plots(results, modele)
 
 def simulation_server(input, output, session, ode_model, markov_model):
     """Logique serveur pour la simulation populationnelle."""
@@ -23,7 +51,7 @@ def simulation_server(input, output, session, ode_model, markov_model):
         mobilite_sociale = input.mobilite_sociale()
         
         # Paramètres communs
-        conditions_initiales = np.array([100000, 200000, 300000, 150000, 50000])  # Population par tranche
+        conditions_initiales = _INITIAL_POP
         t_span = (0, duree)
         params = {
             'taux_croissance': taux_croissance,
@@ -40,7 +68,10 @@ def simulation_server(input, output, session, ode_model, markov_model):
                 results = ode_model.simuler(
                     conditions_initiales=conditions_initiales,
                     t_span=t_span,
-                    params=params
+                    params=params,
+                    # Tolérances alignées sur la précision float32 de l'état initial
+                    rtol=1e-5,
+                    atol=1e-5
                 )
             else:  # markov
                 results = markov_model.simuler(
@@ -103,10 +134,9 @@ def simulation_server(input, output, session, ode_model, markov_model):
         
         return save_matplotlib_figure(fig, width=600, height=300)
 
-    @output
-    @render.text
-    def resume_simulation():
-        """Affiche le résumé de la simulation."""
+    @reactive.calc
+    def _resume_text():
+        """Texte du résumé, mis en cache jusqu'au prochain changement des résultats."""
         results = simulation_results()
         if results is None:
             return "Cliquez sur 'Lancer la simulation' pour voir les résultats"
@@ -122,6 +152,12 @@ def simulation_server(input, output, session, ode_model, markov_model):
         Population finale : {results.get('population_finale', 0):,.0f} personnes
         """
     
+    @output
+    @render.text
+    def resume_simulation():
+        """Affiche le résumé de la simulation."""
+        return _resume_text()
+    
     @output
     @render.table
     def tableau_resultats():
@@ -138,46 +174,60 @@ def simulation_server(input, output, session, ode_model, markov_model):
         
         return df
     
+    @reactive.calc
+    def population_plots():
+        """Figures de la simulation, construites une seule fois pour les 4 sorties."""
+        results = simulation_results()
+        if results is None:
+            return None
+        
+        return _figures_simulation(results, input.modele())
+    
+    def _creer_widget(cle):
+        """Crée le FigureWidget persistant d'une sortie, initialisé avec les résultats courants."""
+        with reactive.isolate():
+            plots = population_plots()
+        
+        return go.FigureWidget(plots[cle] if plots is not None else None)
+    
     @output
     @render_widget
     def plot_evolution():
         """Graphique d'évolution de la répartition."""
-        results = simulation_results()
-        if results is None:
-            return go.Figure()
-        
-        plots = create_population_plots(results, input.modele())
-        return plots['aires']
+        return _creer_widget('aires')
     
     @output
     @render_widget
     def plot_indicators():
         """Graphique des indicateurs socio-économiques."""
-        results = simulation_results()
-        if results is None:
-            return go.Figure()
-        
-        plots = create_population_plots(results, input.modele())
-        return plots['gini']
+        return _creer_widget('gini')
     
     @output
     @render_widget
     def plot_mobilite():
         """Graphique de la matrice de mobilité."""
-        results = simulation_results()
-        if results is None:
-            return go.Figure()
-        
-        plots = create_population_plots(results, input.modele())
-        return plots['mobilite']
+        return _creer_widget('mobilite')
     
     @output
     @render_widget
     def plot_comparison():
         """Graphique de comparaison des modèles."""
-        results = simulation_results()
-        if results is None:
-            return go.Figure()
+        return _creer_widget('recettes')
+    
+    @reactive.effect
+    def update_plots():
+        """Met à jour les widgets en place plutôt que de les reconstruire."""
+        plots = population_plots()
+        if plots is None:
+            return
         
-        plots = create_population_plots(results, input.modele())
-        return plots['recettes']
+        sorties = {
+            'aires': plot_evolution,
+            'gini': plot_indicators,
+            'mobilite': plot_mobilite,
+            'recettes': plot_comparison
+        }
+        for cle, sortie in sorties.items():
+            # Widget pas encore rendu : il sera initialisé par _creer_widget
+            if sortie.widget is not None:
+                update_figure_widget(sortie.widget, plots[cle])
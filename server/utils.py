@@ -1,5 +1,7 @@
 import matplotlib.pyplot as plt
 import tempfile
+import time
+from shiny import reactive
 
 def save_matplotlib_figure(fig, width=800, height=600):
     """Helper pour sauvegarder une figure matplotlib en PNG."""
@@ -8,3 +10,97 @@ def save_matplotlib_figure(fig, width=800, height=600):
                    facecolor='white', edgecolor='none')
         plt.close(fig)  # Libérer la mémoire
         return {"src": tmp.name}
+
+
+def _trace_en_dict(trace):
+    """Trace Plotly (objet go ou dict) sous forme de dict."""
+    return trace if isinstance(trace, dict) else trace.to_plotly_json()
+
+
+def update_figure_widget(widget, fig):
+    """
+    Helper pour recopier une figure Plotly dans un FigureWidget existant.
+    
+    fig peut être un go.Figure ou un dict {'data': [...], 'layout': {...}}.
+    Si les traces ont la même structure (types et noms), elles sont mises à
+    jour en place avec toutes leurs propriétés ; sinon elles sont recréées.
+    La mise en page est remplacée intégralement.
+    """
+    traces = [_trace_en_dict(trace) for trace in fig['data']]
+    structure = [(trace.get('type', 'scatter'), trace.get('name')) for trace in traces]
+    
+    with widget.batch_update():
+        if structure == [(trace.type, trace.name) for trace in widget.data]:
+            for trace_widget, trace in zip(widget.data, traces):
+                proprietes = {cle: valeur for cle, valeur in trace.items() if cle != 'type'}
+                # Les propriétés absentes de la nouvelle trace sont réinitialisées
+                obsoletes = trace_widget.to_plotly_json().keys() - proprietes.keys() - {'type', 'uid'}
+                trace_widget.update({cle: None for cle in obsoletes}, overwrite=True)
+                trace_widget.update(proprietes, overwrite=True)
+        else:
+            widget.data = ()
+            widget.add_traces(traces)
+        widget.layout = fig['layout']
+
+
+def debounce(delai: float):
+    """
+    Décorateur qui ne propage une valeur réactive qu'une fois stabilisée.
+    
+    La fonction décorée est réévaluée à chaque changement de ses dépendances,
+    mais le calcul retourné n'est invalidé qu'après `delai` secondes sans
+    nouveau changement (par exemple à la fin du glissement d'un slider).
+    À utiliser dans une fonction serveur, car il crée des effets de session.
+    
+    Args:
+        delai: Durée de stabilisation en secondes
+        
+    Returns:
+        Décorateur transformant une fonction en calcul réactif débouncé
+    """
+    def decorateur(fonction):
+        echeance = reactive.value(None)
+        declencheur = reactive.value(0)
+        initialise = False
+        
+        @reactive.calc
+        def valeur():
+            return fonction()
+        
+        @reactive.effect(priority=102)
+        def armer():
+            nonlocal initialise
+            # Chaque nouvelle valeur repousse l'échéance
+            try:
+                valeur()
+            except Exception:
+                # L'erreur sera relevée par les consommateurs de valeur_stable
+                pass
+            finally:
+                # La valeur initiale est déjà servie par valeur_stable (reactive.event
+                # s'exécute à l'initialisation) : pas de second déclenchement pour elle
+                if initialise:
+                    echeance.set(time.time() + delai)
+                initialise = True
+        
+        @reactive.effect(priority=101)
+        def minuterie():
+            fin = echeance()
+            if fin is None:
+                return
+            restant = fin - time.time()
+            if restant <= 0:
+                with reactive.isolate():
+                    echeance.set(None)
+                    declencheur.set(declencheur() + 1)
+            else:
+                reactive.invalidate_later(restant)
+        
+        @reactive.calc
+        @reactive.event(declencheur)
+        def valeur_stable():
+            return valeur()
+        
+        return valeur_stable
+    
+    return decorateur
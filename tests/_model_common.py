@@ -0,0 +1,86 @@
+"""
+Tests communs aux modèles de population (EDO et chaîne de Markov).
+
+Les classes de test de chaque modèle héritent de BasePopulationModelTests et
+définissent MODEL_CLS ; pytest collecte les tests hérités dans chaque module.
+"""
+
+import numpy as np
+
+def _population_premiere_tranche(n_tranches):
+    """Population concentrée dans la première tranche."""
+    distribution = np.zeros(n_tranches)
+    distribution[0] = 10000
+    return distribution
+
+
+def _population_uniforme(n_tranches):
+    """Population uniforme."""
+    return np.ones(n_tranches) * 2000
+
+
+def _population_derniere_tranche(n_tranches):
+    """Population concentrée dans la dernière tranche."""
+    distribution = np.zeros(n_tranches)
+    distribution[-1] = 10000
+    return distribution
+
+
+
+class BasePopulationModelTests:
+    """Tests partagés par MarkovPopulationModel et ODEPopulationModel."""
+    
+    # Classe du modèle testé, définie par chaque sous-classe
+    MODEL_CLS = None
+    
+    def test_definir_tranches(self, model):
+        """Test de la définition des tranches."""
+        tranches = model._definir_tranches()
+        
+        assert len(tranches) > 0
+        bornes = np.asarray(tranches)
+        mins, maxs = bornes[:, 0], bornes[:, 1]
+        assert (mins >= 0).all()
+        assert (maxs > mins).all()
+        # Les tranches doivent être ordonnées
+        assert (mins[1:] >= maxs[:-1]).all()
+    
+    def test_calculer_taux_effort(self, model):
+        """Test du calcul du taux d'effort fiscal."""
+        # Revenu nul
+        taux = model._calculer_taux_effort(0)
+        assert taux == 0.0
+        
+        # Revenu négatif
+        taux = model._calculer_taux_effort(-1000)
+        assert taux == 0.0
+        
+        # Revenu normal
+        revenu = 50000
+        taux = model._calculer_taux_effort(revenu)
+        assert 0 <= taux <= 1
+    
+    def test_calculer_gini(self, model):
+        """Test du calcul de l'indice de Gini."""
+        n_tranches = 3
+        n_points = 5
+        
+        # Distribution égalitaire
+        repartition_egal = np.ones((n_tranches, n_points)) / n_tranches
+        revenus_moyens = np.array([10000, 20000, 30000])
+        
+        gini_egal = model._calculer_gini(repartition_egal, revenus_moyens)
+        assert (gini_egal >= 0).all()
+        assert (gini_egal <= 1).all()
+        
+        # Distribution inégalitaire
+        repartition_inegal = np.zeros((n_tranches, n_points))
+        repartition_inegal[0, :] = 0.8  # 80% dans la tranche basse
+        repartition_inegal[-1, :] = 0.2  # 20% dans la tranche haute
+        
+        gini_inegal = model._calculer_gini(repartition_inegal, revenus_moyens)
+        assert (gini_inegal >= 0).all()
+        assert (gini_inegal <= 1).all()
+        
+        # L'indice de Gini devrait être plus élevé pour la distribution inégalitaire
+        np.testing.assert_array_less(gini_egal - 1e-12, gini_inegal)
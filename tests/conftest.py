@@ -0,0 +1,82 @@
+"""
+Fixtures partagées par les tests.
+
+Les fixtures des modèles de population (EDO et chaîne de Markov) de portée
+« class » s'appuient sur l'attribut MODEL_CLS de la classe de test ; les objets
+partagés ne doivent pas être modifiés.
+"""
+
+import copy
+import pytest
+import numpy as np
+import sys
+import os
+
+# Ajouter le répertoire parent au path pour les imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import bareme as bareme_module
+from utils.bareme import get_bareme_2024
+
+
+@pytest.fixture(autouse=True)
+def cache_tables(tmp_path, monkeypatch):
+    """Répertoire temporaire pour les tables persistées : aucun test n'écrit dans ~/.cache."""
+    repertoire = tmp_path / "cache"
+    monkeypatch.setattr(bareme_module, '_CACHE_DIR', str(repertoire))
+    return repertoire
+
+
+@pytest.fixture(scope="session")
+def bareme():
+    """Barème 2024 partagé par tous les tests."""
+    return get_bareme_2024()
+
+
+@pytest.fixture(scope="class")
+def model(request, bareme):
+    """Modèle partagé par les tests d'une même classe (ne pas modifier son état)."""
+    return request.cls.MODEL_CLS(bareme)
+
+
+@pytest.fixture
+def fresh_model(model):
+    """Copie du modèle pour les tests qui modifient son état."""
+    return copy.copy(model)
+
+
+@pytest.fixture(scope="class")
+def standard_params():
+    """Paramètres communs à la plupart des tests."""
+    return {
+        'g': 0.02,
+        'pi': 0.01,
+        'alpha': 0.1,
+        'beta': 0.05
+    }
+
+
+@pytest.fixture(scope="class")
+def uniform_pop_1000(model):
+    """Distribution uniforme de 1000 individus par tranche, en lecture seule."""
+    distribution = np.full(model.n_tranches, 1000.0)
+    distribution.setflags(write=False)
+    return distribution
+
+
+@pytest.fixture(scope="class")
+def sim_standard(request, model, standard_params, uniform_pop_1000):
+    """
+    Simulation de référence avec les paramètres standards (ne pas modifier).
+    
+    Les options propres au modèle (pas de temps...) sont lues dans l'attribut
+    SIM_STANDARD_KWARGS de la classe de test.
+    """
+    options = getattr(request.cls, 'SIM_STANDARD_KWARGS', {})
+    return copy.copy(model).simuler(uniform_pop_1000, (0, 5), standard_params, **options)
+
+
+@pytest.fixture(scope="class")
+def baseline_sim(model, standard_params, uniform_pop_1000):
+    """Simulation de base des scénarios de politique fiscale (ne pas modifier)."""
+    return copy.copy(model).simuler(uniform_pop_1000, (0, 3), standard_params)
@@ -0,0 +1,118 @@
+"""
+Tests unitaires pour le barème fiscal.
+"""
+
+import pytest
+import numpy as np
+import sys
+import os
+
+# Ajouter le répertoire parent au path pour les imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import utils.bareme as bareme_module
+from utils.bareme import BaremeFiscal, get_bareme_2024, calculer_taux_effectif
+
+
+def _impot_sequentiel(bareme, revenu):
+    """Algorithme de référence : découpage séquentiel du revenu restant."""
+    impot = 0.0
+    revenu_restant = revenu
+    for tranche in bareme.tranches:
+        if revenu_restant <= 0:
+            break
+        montant_tranche = min(revenu_restant, tranche['max'] - tranche['min'])
+        impot += montant_tranche * tranche['taux']
+        revenu_restant -= montant_tranche
+    return impot
+
+
+class TestBaremeFiscal:
+    """Tests pour la classe BaremeFiscal."""
+    
+    def setup_method(self):
+        """Configuration avant chaque test."""
+        self.bareme = get_bareme_2024()
+        self.revenus = np.linspace(-1000, 300000, 301)
+    
+    def test_calculer_impot_tableau(self):
+        """Le calcul sur un tableau correspond au calcul revenu par revenu."""
+        attendu = [self.bareme.calculer_impot(r) for r in self.revenus]
+        
+        np.testing.assert_allclose(self.bareme.calculer_impot(self.revenus), attendu,
+                                   rtol=0, atol=1e-6)
+    
+    def test_calculer_impot_forme_close(self):
+        """La forme close correspond au découpage séquentiel du revenu."""
+        attendu = [_impot_sequentiel(self.bareme, r) for r in self.revenus]
+        
+        np.testing.assert_allclose(self.bareme.calculer_impot(self.revenus), attendu,
+                                   rtol=0, atol=1e-6)
+    
+    @pytest.mark.parametrize("parts", [1.0, 1.5, 2.0, 2.5, 4.0])
+    def test_calculer_impot_net_vec(self, parts):
+        """La version vectorisée correspond à calculer_impot_net."""
+        attendu = [self.bareme.calculer_impot_net(r, parts) for r in self.revenus]
+        
+        impots = self.bareme.calculer_impot_net_vec(self.revenus, parts)
+        
+        assert impots.shape == self.revenus.shape
+        np.testing.assert_allclose(impots, attendu, rtol=0, atol=1e-6)
+    
+    def test_calculer_impot_net_vec_parts_tableau(self):
+        """Les parts peuvent varier d'un contribuable à l'autre."""
+        revenus = np.array([20000.0, 50000.0, 50000.0, 120000.0])
+        parts = np.array([1.0, 1.5, 2.0, 3.0])
+        attendu = [self.bareme.calculer_impot_net(r, p) for r, p in zip(revenus, parts)]
+        
+        np.testing.assert_allclose(self.bareme.calculer_impot_net_vec(revenus, parts),
+                                   attendu, rtol=0, atol=1e-6)
+    
+    def test_calculer_taux_effectif(self):
+        """Le résultat est un TauxResult partagé depuis le cache."""
+        resultat = calculer_taux_effectif(50000, 1.0, self.bareme)
+        
+        assert resultat.impot_net == self.bareme.calculer_impot_net(50000, 1.0)
+        assert resultat.taux_effectif == resultat.impot_net / 50000
+        assert calculer_taux_effectif(50000, 1.0, self.bareme) is resultat
+    
+    def test_impot_net_precalcule(self):
+        """La table précalculée correspond au calcul direct, sur et hors grille."""
+        for revenu, parts in [(35000, 1.0), (60000, 2.5), (200000, 1.0), (35500, 1.0)]:
+            np.testing.assert_allclose(self.bareme.impot_net_precalcule(revenu, parts),
+                                       self.bareme.calculer_impot_net(revenu, parts),
+                                       rtol=1e-6)
+    
+    def test_get_taux_marginal(self):
+        """Taux marginal aux bornes des tranches, en scalaire et en tableau."""
+        revenus = np.array([-1000, 0, 11497, 11498, 29315, 29316, 180295, 1e7])
+        attendu = np.array([0.0, 0.0, 0.0, 0.11, 0.11, 0.30, 0.45, 0.45])
+        
+        np.testing.assert_array_equal(self.bareme.get_taux_marginal(revenus), attendu)
+        assert self.bareme.get_taux_marginal(50000) == 0.30
+    
+    def test_tranches_non_triees(self):
+        """Un barème fourni dans le désordre est trié par borne inférieure."""
+        bareme_inverse = BaremeFiscal(list(reversed(self.bareme.tranches)))
+        
+        assert bareme_inverse.tranches == self.bareme.tranches
+        assert bareme_inverse.calculer_impot(50000) == self.bareme.calculer_impot(50000)
+    
+    def test_precompute_table_persistee(self, cache_tables):
+        """La table persistée est rechargée à l'identique."""
+        table = self.bareme.precompute_table()
+        assert len(list(cache_tables.glob("table_*.npy"))) == 1
+        
+        table_rechargee = BaremeFiscal(self.bareme.tranches).precompute_table()
+        np.testing.assert_array_equal(table_rechargee, table)
+    
+    def test_chemin_table_depend_de_la_version(self, monkeypatch):
+        """Changer la version ou les constantes du calcul invalide les tables persistées."""
+        revenus, parts = np.arange(0, 10001, 1000), np.array([1.0, 2.0])
+        chemin = self.bareme._chemin_table(revenus, parts)
+        
+        for constante, valeur in [('_VERSION_TABLE', bareme_module._VERSION_TABLE + 1),
+                                  ('_COEF_DECOTE', 0.5), ('_PLAFOND_QUOTIENT', 1900.0)]:
+            with monkeypatch.context() as patch:
+                patch.setattr(bareme_module, constante, valeur)
+                assert self.bareme._chemin_table(revenus, parts) != chemin
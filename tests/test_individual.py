@@ -109,10 +109,18 @@ class TestIndividualTaxCalculator:
         resultat = self.calculator.calculer_impot_complet(revenu, 1.0)
         
         # Vérifier que le détail des tranches est cohérent
-        assert len(resultat['detail_tranches']) > 0
+        assert len(resultat['detail_tranches']['impot']) > 0
         
-        total_impot_detail = sum(tranche['impot'] for tranche in resultat['detail_tranches'])
-        assert abs(total_impot_detail - resultat['impot_quotient']) < 1e-6
+        np.testing.assert_allclose(resultat['detail_tranches']['impot'].sum(),
+                                   resultat['impot_quotient'], rtol=0, atol=1e-6)
+    
+    def test_detail_tranches_somme_impot_quotient(self):
+        """La somme du détail par tranche redonne l'impôt sur le quotient."""
+        rng = np.random.default_rng(0)
+        for revenu in rng.uniform(0, 2_000_000, 500):
+            resultat = self.calculator.calculer_impot_complet(revenu, 1.0)
+            np.testing.assert_allclose(resultat['detail_tranches']['impot'].sum(),
+                                       resultat['impot_quotient'], rtol=0, atol=1e-6)
     
     def test_generation_courbe_taux(self):
         """Test de la génération de la courbe des taux."""
@@ -132,6 +140,20 @@ class TestIndividualTaxCalculator:
         assert (courbe['taux_effectif'] >= 0).all()
         assert (courbe['taux_effectif'] <= 1).all()
     
+    def test_courbe_taux_coherente_avec_calcul_scalaire(self):
+        """La courbe vectorisée reproduit le calcul revenu par revenu."""
+        parts = 2.5
+        courbe = self.calculator.generer_courbe_taux(revenu_max=150000, parts=parts, nb_points=50)
+        bareme = self.calculator.bareme
+        
+        for ligne in courbe.iloc[1:].itertuples():
+            quotient = ligne.revenu / parts
+            assert ligne.taux_marginal == bareme.get_taux_marginal(quotient)
+            assert ligne.taux_moyen == pytest.approx(bareme.get_taux_moyen(quotient))
+            assert ligne.taux_effectif == pytest.approx(
+                bareme.calculer_impot_net(ligne.revenu, parts) / ligne.revenu)
+        assert courbe.iloc[0][['taux_marginal', 'taux_moyen', 'taux_effectif']].eq(0).all()
+    
     def test_modification_bareme(self):
         """Test de la modification du barème."""
         modifications = [{'tranche': 4, 'taux': 0.50}]  # Augmenter la tranche haute
@@ -0,0 +1,156 @@
+"""
+Tests unitaires pour les utilitaires du serveur Shiny.
+"""
+
+import asyncio
+import pytest
+import numpy as np
+import plotly.graph_objects as go
+import sys
+import os
+
+# Ajouter le répertoire parent au path pour les imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from server.simulation import _CLES_FIGURES, _figures_simulation
+from server.utils import debounce, update_figure_widget
+from shiny import reactive
+
+
+def _resultats_simulation(n_points=50, n_tranches=5):
+    """Résultats de simulation minimaux de n_points instants."""
+    temps = np.linspace(0, 10, n_points)
+    return {
+        'temps': temps,
+        'population': np.ones((n_tranches, n_points)) * 1000,
+        'indicateurs': {
+            'recettes': np.cos(temps) * 1e6 + 2e6,
+            'gini': 0.3 + 0.1 * np.sin(temps),
+            'mobilite_ascendante': np.exp(-temps),
+            'revenu_moyen_global': 30000 + temps * 100
+        }
+    }
+
+
+class TestFiguresSimulation:
+    """Tests pour la construction des figures de l'onglet simulation."""
+    
+    def test_resultats_valides(self):
+        """Chaque sortie reçoit sa figure de simulation."""
+        figures = _figures_simulation(_resultats_simulation(), 'ode')
+        
+        for cle in _CLES_FIGURES:
+            assert len(figures[cle]['data']) > 0
+    
+    def test_simulation_en_erreur(self):
+        """Une simulation en erreur donne des figures vides titrées par le message, sans exception."""
+        resultats = {'population_initiale': 800000, 'modele_utilise': 'ode',
+                     'erreur': 'intégration impossible'}
+        
+        figures = _figures_simulation(resultats, 'ode')
+        
+        assert set(figures) == set(_CLES_FIGURES)
+        for figure in figures.values():
+            assert len(figure.data) == 0
+            assert 'intégration impossible' in figure.layout.title.text
+
+
+class TestUpdateFigureWidget:
+    """Tests pour la mise à jour en place des FigureWidget."""
+    
+    def setup_method(self):
+        """
+        Configuration avant chaque test.
+        
+        shinywidgets interdit de créer un FigureWidget hors session Shiny : on
+        utilise un go.Figure, qui expose la même API (batch_update, data, layout).
+        """
+        self.widget = go.Figure(go.Figure(
+            data=[dict(type='scatter', x=[1, 2], y=[3, 4], name='a',
+                       text=['u', 'v'], marker=dict(size=3))],
+            layout=dict(title=dict(text='Avant'), xaxis=dict(title=dict(text='X')))
+        ))
+    
+    def test_meme_structure_mise_a_jour_complete(self):
+        """Données, propriétés et mise en page sont toutes recopiées."""
+        trace_avant = self.widget.data[0]
+        
+        update_figure_widget(self.widget, go.Figure(
+            data=[dict(type='scatter', x=[1, 2, 3], y=[5, 6, 7], name='a',
+                       marker=dict(color='red'))],
+            layout=dict(title=dict(text='Après'))
+        ))
+        
+        trace = self.widget.data[0]
+        assert trace is trace_avant  # mise à jour en place
+        assert trace.x == (1, 2, 3) and trace.y == (5, 6, 7)
+        assert trace.marker.color == 'red' and trace.marker.size is None
+        assert trace.text is None
+        assert self.widget.layout.title.text == 'Après'
+        assert self.widget.layout.xaxis.title.text is None
+    
+    def test_changement_de_type_recree_les_traces(self):
+        """Un changement de type de trace (ex. passage en WebGL) recrée les traces."""
+        update_figure_widget(self.widget, {
+            'data': [dict(type='scattergl', x=[1, 2], y=[3, 4], name='a')],
+            'layout': {}
+        })
+        
+        assert [trace.type for trace in self.widget.data] == ['scattergl']
+    
+    def test_figure_d_erreur_vide_le_widget(self):
+        """La figure d'une simulation en erreur efface les traces existantes."""
+        figures = _figures_simulation({'erreur': 'échec'}, 'ode')
+        
+        update_figure_widget(self.widget, figures['aires'])
+        
+        assert len(self.widget.data) == 0
+        assert 'échec' in self.widget.layout.title.text
+
+
+class TestDebounce:
+    """Tests pour le décorateur debounce (hors session Shiny)."""
+    
+    DELAI = 0.05
+    
+    def _executer(self, scenario):
+        """Exécute un scénario asynchrone recevant la source, les valeurs vues et une pause."""
+        async def principal():
+            source = reactive.value(0)
+            valeurs = []
+            
+            @debounce(self.DELAI)
+            def stable():
+                return source()
+            
+            @reactive.effect
+            def consommateur():
+                valeurs.append(stable())
+            
+            async def attendre(duree):
+                await reactive.flush()
+                await asyncio.sleep(duree)
+                await reactive.flush()
+            
+            await attendre(3 * self.DELAI)
+            await scenario(source, attendre)
+            return valeurs
+        
+        return asyncio.run(principal())
+    
+    def test_valeur_initiale_servie_une_seule_fois(self):
+        """À l'initialisation, le consommateur n'est exécuté qu'une fois."""
+        async def scenario(source, attendre):
+            pass
+        
+        assert self._executer(scenario) == [0]
+    
+    def test_rafale_regroupee(self):
+        """Une rafale de changements ne propage que la dernière valeur, après stabilisation."""
+        async def scenario(source, attendre):
+            for valeur in (1, 2, 3):
+                source.set(valeur)
+                await attendre(self.DELAI / 5)
+            await attendre(3 * self.DELAI)
+        
+        assert self._executer(scenario) == [0, 3]
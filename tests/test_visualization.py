@@ -0,0 +1,227 @@
+"""
+Tests unitaires pour les fonctions de visualisation.
+"""
+
+import pytest
+import json
+import numpy as np
+import plotly.graph_objects as go
+import sys
+import os
+
+# Ajouter le répertoire parent au path pour les imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.individual import IndividualTaxCalculator
+from utils import visualization
+from utils.visualization import (
+    _N_POINTS_MAX, _SEUIL_TEXTE_HEATMAP, _TAILLE_HEATMAP_MAX, _courbe_taux_cache,
+    _downsample, _series_listes, create_tax_plots, create_population_plots,
+    create_comparison_plots, create_barème_plot, create_heatmap_mobilite,
+    create_dashboard_summary
+)
+
+
+def _resultats_synthetiques(n_points, n_tranches=5):
+    """Résultats de simulation synthétiques de n_points instants."""
+    temps = np.linspace(0, 10, n_points)
+    population = np.abs(np.sin(np.outer(np.arange(1, n_tranches + 1), temps))) * 1000 + 1
+    indicateurs = {
+        'recettes': np.cos(temps) * 1e6 + 2e6,
+        'gini': 0.3 + 0.1 * np.sin(temps),
+        'mobilite_ascendante': np.exp(-temps),
+        'revenu_moyen_global': 30000 + temps * 100
+    }
+    return {'temps': temps, 'population': population, 'indicateurs': indicateurs}
+
+
+def _en_figures(figures):
+    """Valide les figures (go.Figure ou dicts bruts) en les convertissant en go.Figure."""
+    return {cle: go.Figure(figure) for cle, figure in figures.items()}
+
+
+class TestDownsample:
+    """Tests pour la réduction des séries temporelles."""
+    
+    def test_serie_courte_inchangee(self):
+        """Une série plus courte que n_out est renvoyée telle quelle."""
+        x = np.arange(10.0)
+        x_red, y_red = _downsample(x, x ** 2, n_out=20)
+        
+        np.testing.assert_array_equal(x_red, x)
+        np.testing.assert_array_equal(y_red, x ** 2)
+    
+    def test_serie_longue_reduite(self):
+        """La réduction conserve les extrémités et les pics."""
+        x = np.arange(10000.0)
+        y = np.zeros_like(x)
+        y[4321] = 50.0
+        
+        x_red, y_red = _downsample(x, y, n_out=100)
+        
+        assert len(x_red) == 100
+        assert x_red[0] == x[0] and x_red[-1] == x[-1]
+        assert (np.diff(x_red) > 0).all()
+        assert 50.0 in y_red
+    
+    def test_series_listes_abscisses_partagees(self):
+        """Sans réduction, toutes les séries partagent la même liste d'abscisses."""
+        indicateurs = _resultats_synthetiques(100)['indicateurs']
+        
+        series = _series_listes(np.arange(100.0), indicateurs, ('recettes', 'gini'))
+        
+        x_recettes, y_recettes = series['recettes']
+        assert x_recettes is series['gini'][0]
+        assert isinstance(y_recettes, list)
+        np.testing.assert_allclose(y_recettes, indicateurs['recettes'])
+
+
+class TestFiguresIndividuelles:
+    """Tests pour les figures du calculateur individuel."""
+    
+    def setup_method(self):
+        """Configuration avant chaque test."""
+        self.calculator = IndividualTaxCalculator()
+    
+    def test_create_tax_plots(self):
+        """La courbe d'impôt correspond au calcul revenu par revenu."""
+        figures = create_tax_plots(self.calculator, 60000, 2.5)
+        
+        assert set(figures) == {'taux', 'tranches', 'impot'}
+        courbe = figures['impot'].data[0]
+        attendu = [self.calculator.bareme.calculer_impot_net(r, 2.5) for r in courbe.x]
+        np.testing.assert_allclose(courbe.y, attendu, rtol=0, atol=1e-6)
+    
+    def test_courbe_taux_partagee_par_bareme(self):
+        """Deux calculateurs du même barème partagent la courbe des taux, en lecture seule."""
+        create_tax_plots(self.calculator, 60000, 2.5)
+        autre = IndividualTaxCalculator(self.calculator.bareme)
+        
+        courbe = _courbe_taux_cache(autre.bareme, 120000, 2.5)
+        assert _courbe_taux_cache(self.calculator.bareme, 120000, 2.5) is courbe
+        with pytest.raises(ValueError):
+            courbe['taux_moyen'][0] = 1.0
+    
+    def test_create_bareme_plot(self):
+        """Le barème est rendu par une seule trace Bar couvrant chaque tranche."""
+        fig = create_barème_plot(self.calculator.bareme)
+        
+        assert len(fig.data) == 1
+        barres = fig.data[0]
+        tranches = self.calculator.bareme.tranches
+        assert barres.type == 'bar'
+        assert len(barres.x) == len(tranches)
+        np.testing.assert_allclose(barres.y, [t['taux'] * 100 for t in tranches])
+        np.testing.assert_allclose(np.asarray(barres.x) - np.asarray(barres.width) / 2,
+                                   [t['min'] for t in tranches])
+
+
+class TestFiguresPopulation:
+    """Tests pour les figures de simulation populationnelle."""
+    
+    @pytest.fixture(autouse=True, params=[True, False], ids=["dict", "figure"])
+    def mode_fast(self, request, monkeypatch):
+        """Exécute chaque test avec et sans FAST_PLOTLY."""
+        monkeypatch.setattr(visualization, '_FAST', request.param)
+        return request.param
+    
+    def test_format_des_figures(self, mode_fast):
+        """FAST_PLOTLY retourne des dicts sérialisables en JSON, sinon des go.Figure."""
+        figures = create_population_plots(_resultats_synthetiques(100))
+        
+        for figure in figures.values():
+            if mode_fast:
+                assert isinstance(figure, dict)
+                json.dumps(figure)
+                # Le gabarit nommé est développé : Plotly.js ne connaît pas "fiscal"
+                assert isinstance(figure['layout']['template'], dict)
+                # Clés imbriquées uniquement : Plotly.js ignore les raccourcis de plotly.py
+                assert not any('_' in cle for cle in figure['layout'])
+                assert 'text' in figure['layout']['xaxis']['title']
+            else:
+                assert isinstance(figure, go.Figure)
+    
+    def test_dashboard_axes_plotly_js(self, mode_fast):
+        """Le premier panneau utilise xaxis/x : Plotly.js ne connaît pas xaxis1/x1."""
+        figure = create_dashboard_summary(_resultats_synthetiques(100))
+        if not mode_fast:
+            figure = figure.to_dict()
+        
+        assert 'xaxis' in figure['layout'] and 'xaxis1' not in figure['layout']
+        assert [trace['xaxis'] for trace in figure['data']] == ['x', 'x2', 'x3', 'x4']
+    
+    def test_dashboard_sans_etat_partage(self, mode_fast):
+        """Modifier une figure retournée n'altère pas les suivantes."""
+        resultats = _resultats_synthetiques(100)
+        premiere = create_dashboard_summary(resultats)
+        attendu = go.Figure(premiere).to_dict()['layout']
+        
+        premiere['layout']['annotations'][0]['text'] = "modifié"
+        premiere['layout']['template']['layout']['font']['size'] = 99
+        
+        seconde = go.Figure(create_dashboard_summary(resultats)).to_dict()['layout']
+        assert seconde == attendu
+    
+    @pytest.mark.parametrize("n_points", [100, 10000], ids=["court", "long"])
+    def test_create_population_plots(self, n_points):
+        """Toutes les figures sont créées avec au plus _N_POINTS_MAX points par trace."""
+        figures = _en_figures(create_population_plots(_resultats_synthetiques(n_points)))
+        
+        assert set(figures) == {'aires', 'recettes', 'mobilite', 'gini', 'revenu'}
+        assert len(figures['aires'].data) == 5
+        for figure in figures.values():
+            for trace in figure.data:
+                assert len(trace.x) == min(n_points, _N_POINTS_MAX)
+        
+        # WebGL pour les longues séries, sauf les aires empilées (stackgroup)
+        assert figures['aires'].data[0].type == 'scatter'
+        attendu = 'scattergl' if n_points > 2000 else 'scatter'
+        assert figures['recettes'].data[0].type == attendu
+    
+    def test_create_comparison_plots(self):
+        """Les figures de comparaison contiennent la base et le scénario."""
+        resultats = {
+            'base': _resultats_synthetiques(100),
+            'choc': _resultats_synthetiques(100),
+            'delta_tau': 0.05
+        }
+        
+        figures = _en_figures(create_comparison_plots(resultats))
+        
+        assert set(figures) == {'recettes', 'gini', 'mobilite'}
+        for figure in figures.values():
+            assert len(figure.data) == 2
+    
+    def test_create_comparison_plots_sans_scenario(self):
+        """Sans choc ni redistribution, seules les courbes de base sont tracées."""
+        figures = _en_figures(create_comparison_plots({'base': _resultats_synthetiques(100)}))
+        
+        assert set(figures) == {'recettes', 'gini', 'mobilite'}
+        for figure in figures.values():
+            assert [trace.name for trace in figure.data] == ['Scénario de base']
+    
+    def test_create_dashboard_summary(self):
+        """Le tableau de bord contient les quatre indicateurs."""
+        figure = go.Figure(create_dashboard_summary(_resultats_synthetiques(100)))
+        
+        assert len(figure.data) == 4
+        # Un panneau (couple d'axes) par indicateur
+        assert len({(trace.xaxis, trace.yaxis) for trace in figure.data}) == 4
+        assert len(figure.layout.annotations) == 4
+    
+    @pytest.mark.parametrize("n_etats", [5, 50, 200])
+    def test_create_heatmap_mobilite(self, n_etats):
+        """Les grandes matrices sont agrégées par blocs et perdent leurs étiquettes."""
+        rng = np.random.default_rng(0)
+        matrice = rng.random((n_etats, n_etats))
+        
+        heatmap = create_heatmap_mobilite(matrice).data[0]
+        z = np.asarray(heatmap.z)
+        
+        assert z.shape[0] <= _TAILLE_HEATMAP_MAX
+        assert (heatmap.text is None) == (n_etats > _SEUIL_TEXTE_HEATMAP)
+        if n_etats <= _TAILLE_HEATMAP_MAX:
+            np.testing.assert_allclose(z, matrice)
+        else:
+            k = -(-n_etats // _TAILLE_HEATMAP_MAX)
+            assert z[0, 0] == pytest.approx(matrice[:k, :k].mean())
@@ -5,10 +5,84 @@ Contient le barème officiel et les fonctions pour calculer l'impôt individuel
 avec gestion de la décote et du plafonnement.
 """
 
+import hashlib
+import os
 import numpy as np
-import pandas as pd
+from collections import namedtuple
+from functools import lru_cache
 from typing import Dict, List, Tuple, Optional
 
+try:
+    import numba
+except ImportError:  # numba est optionnel : repli sur le calcul NumPy
+    numba = None
+
+
+# Décote 2024 : seuil par nombre de parts (pas de décote dans les autres cas)
+_DECOTE_PARTS = np.array([1.0, 1.5, 2.0])
+_DECOTE_SEUILS = np.array([1196.0, 1970.0, 2392.0])
+
+
+# Décote : fraction de l'impôt brut retranchée du seuil
+_COEF_DECOTE = 0.75
+
+# Plafonnement du quotient familial 2024 : avantage maximal par demi-part au-delà de 1 part
+_PLAFOND_QUOTIENT = 1850.0
+
+
+def _seuil_decote(parts):
+    """Retourne le seuil de décote pour un nombre de parts (scalaire ou tableau)."""
+    indices = np.minimum(np.searchsorted(_DECOTE_PARTS, parts), len(_DECOTE_PARTS) - 1)
+    return np.where(_DECOTE_PARTS[indices] == parts, _DECOTE_SEUILS[indices], 0.0)
+
+
+# Répertoire de persistance des tables précalculées (cf. precompute_table)
+_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "tp-impots")
+
+# Version du format et de l'algorithme des tables persistées : à incrémenter à
+# chaque modification du calcul de l'impôt net pour invalider les anciennes tables
+_VERSION_TABLE = 1
+
+# Taille à partir de laquelle le noyau numba remplace le calcul NumPy
+_SEUIL_NUMBA = 256
+
+if numba is not None:
+    @numba.njit(cache=True, parallel=True)
+    def _impot_net_kernel(revenus, parts, debuts, widths, taux,
+                          appliquer_decote, appliquer_plafonnement):
+        """
+        Noyau compilé de calculer_impot_net_vec : une seule passe par contribuable
+        (barème, décote et plafonnement fusionnés, sans tableaux intermédiaires).
+        """
+        impots = np.zeros(revenus.shape[0])
+        for k in numba.prange(revenus.shape[0]):
+            revenu = revenus[k]
+            nb_parts = parts[k]
+            if revenu <= 0:
+                continue
+            
+            # Impôt sur le quotient et impôt sans quotient (pour le plafonnement)
+            quotient = revenu / nb_parts
+            impot_quotient = 0.0
+            impot_sans_quotient = 0.0
+            for i in range(taux.shape[0]):
+                impot_quotient += min(max(quotient - debuts[i], 0.0), widths[i]) * taux[i]
+                impot_sans_quotient += min(max(revenu - debuts[i], 0.0), widths[i]) * taux[i]
+            impot = impot_quotient * nb_parts
+            
+            if appliquer_decote:
+                seuil = 0.0
+                for i in range(_DECOTE_PARTS.shape[0]):
+                    if _DECOTE_PARTS[i] == nb_parts:
+                        seuil = _DECOTE_SEUILS[i]
+                impot = max(0.0, impot - max(0.0, seuil - _COEF_DECOTE * impot))
+            
+            if appliquer_plafonnement and nb_parts > 1:
+                impot = min(impot, impot_sans_quotient - (nb_parts - 1) * _PLAFOND_QUOTIENT)
+            
+            impots[k] = max(0.0, impot)
+        return impots
+
 
 class BaremeFiscal:
     """Classe pour gérer le barème fiscal français."""
@@ -20,15 +94,50 @@ class BaremeFiscal:
         Args:
             bareme_data: Liste de dictionnaires avec 'min', 'max', 'taux'
         """
-        self.bareme = pd.DataFrame(bareme_data)
-        self.bareme = self.bareme.sort_values('min').reset_index(drop=True)
+        # Tranches stockées en tableaux NumPy, triées par borne inférieure
+        mins = np.array([tranche['min'] for tranche in bareme_data], dtype=float)
+        maxs = np.array([tranche['max'] for tranche in bareme_data], dtype=float)
+        taux = np.array([tranche['taux'] for tranche in bareme_data], dtype=float)
+        # Les barèmes fournis sont en général déjà triés : tri seulement si nécessaire
+        if not (np.diff(mins) >= 0).all():
+            ordre = np.argsort(mins)
+            mins, maxs, taux = mins[ordre], maxs[ordre], taux[ordre]
+        widths = maxs - mins
+        # Début de chaque tranche dans le revenu restant (somme des largeurs précédentes)
+        debuts = np.concatenate(([0.0], np.cumsum(widths)[:-1]))
+        
+        # Bornes en float32 (montants en euros, précision largement suffisante) ;
+        # les taux restent en float64 pour rester exactement comparables (0.45, 0.11...)
+        self._mins = mins.astype(np.float32)
+        self._maxs = maxs.astype(np.float32)
+        self._widths = widths.astype(np.float32)
+        self._debuts = debuts.astype(np.float32)
+        self._taux = taux
+        
+        # Table d'impôts précalculée (construite à la demande, cf. precompute_table)
+        self._table = None
+        self._table_revenus = None
+        self._table_parts = None
         
+    @property
+    def tranches(self) -> List[Dict]:
+        """Tranches triées du barème, au format attendu par le constructeur."""
+        return [{'min': float(bas), 'max': float(haut), 'taux': float(taux)}
+                for bas, haut, taux in zip(self._mins, self._maxs, self._taux)]
+    
     def get_taux_marginal(self, revenu: float) -> float:
-        """Retourne le taux marginal pour un revenu donné."""
-        for _, tranche in self.bareme.iterrows():
-            if tranche['min'] <= revenu <= tranche['max']:
-                return tranche['taux']
-        return 0.0
+        """
+        Retourne le taux marginal pour un revenu donné.
+        
+        Recherche dichotomique sur les bornes supérieures des tranches ;
+        revenu peut aussi être un tableau NumPy.
+        """
+        revenu = np.asarray(revenu, dtype=float)
+        indices = np.minimum(np.searchsorted(self._maxs, revenu, side='left'),
+                             len(self._taux) - 1)
+        # Aucun taux sous la borne inférieure du barème (revenu négatif)
+        taux = np.where(revenu >= self._mins[0], self._taux[indices], 0.0)
+        return float(taux) if taux.ndim == 0 else taux
     
     def get_taux_moyen(self, revenu: float) -> float:
         """Retourne le taux moyen pour un revenu donné."""
@@ -41,29 +150,19 @@ class BaremeFiscal:
         """
         Calcule l'impôt brut selon le barème progressif.
         
+        Le calcul est vectorisé : revenu peut aussi être un tableau NumPy.
+        
         Args:
-            revenu: Revenu imposable
+            revenu: Revenu imposable (scalaire ou tableau)
             
         Returns:
-            Montant de l'impôt brut
+            Montant de l'impôt brut (même forme que revenu)
         """
-        if revenu <= 0:
-            return 0.0
-            
-        impot = 0.0
-        revenu_restant = revenu
-        
-        for _, tranche in self.bareme.iterrows():
-            if revenu_restant <= 0:
-                break
-                
-            # Montant imposable dans cette tranche
-            montant_tranche = min(revenu_restant, tranche['max'] - tranche['min'])
-            if montant_tranche > 0:
-                impot += montant_tranche * tranche['taux']
-                revenu_restant -= montant_tranche
-                
-        return impot
+        # Montant imposable dans chaque tranche, puis somme pondérée par les taux
+        montants = np.clip(np.asarray(revenu, dtype=float)[..., None] - self._debuts,
+                           0, self._widths)
+        impot = montants @ self._taux
+        return float(impot) if impot.ndim == 0 else impot
     
     def calculer_impot_net(self, revenu: float, parts: float = 1.0, 
                           decote: bool = True, plafonnement: bool = True) -> float:
@@ -101,18 +200,160 @@ class BaremeFiscal:
             
         return max(0, impot_brut)
     
-    def _appliquer_decote(self, impot_brut: float, parts: float) -> float:
-        """Applique la décote si applicable."""
-        if parts == 1:
-            decote = max(0, 1196 - 0.75 * impot_brut)
-        elif parts == 1.5:
-            decote = max(0, 1970 - 0.75 * impot_brut)
-        elif parts == 2:
-            decote = max(0, 2392 - 0.75 * impot_brut)
-        else:
-            decote = 0
+    def calculer_impot_net_vec(self, revenus: np.ndarray, parts=1.0,
+                               decote: bool = True, plafonnement: bool = True) -> np.ndarray:
+        """
+        Calcule l'impôt net de tout un ensemble de contribuables en une passe NumPy.
+        
+        Équivalent vectorisé de calculer_impot_net : la décote et le plafonnement
+        sont appliqués par tables et masques plutôt que par branches. Au-delà de
+        _SEUIL_NUMBA contribuables, un noyau numba est utilisé s'il est installé.
+        
+        Args:
+            revenus: Tableau des revenus imposables
+            parts: Nombre de parts fiscales (scalaire ou tableau de même forme)
+            decote: Appliquer la décote
+            plafonnement: Appliquer le plafonnement
+            
+        Returns:
+            Tableau des impôts nets
+        """
+        revenus, parts = np.broadcast_arrays(np.asarray(revenus, dtype=float),
+                                             np.asarray(parts, dtype=float))
+        
+        # Gros volumes : noyau numba fusionné si disponible
+        if numba is not None and revenus.size > _SEUIL_NUMBA:
+            # Copies contiguës : les vues de broadcast_arrays ne sont pas inscriptibles
+            impots = _impot_net_kernel(np.array(revenus).ravel(), np.array(parts).ravel(),
+                                       self._debuts, self._widths, self._taux,
+                                       decote, plafonnement)
+            return impots.reshape(revenus.shape)
+        
+        # Impôt brut sur le quotient familial, ramené au foyer
+        impot_brut = self.calculer_impot(revenus / parts) * parts
+        
+        # Décote
+        if decote:
+            impot_brut = self._appliquer_decote(impot_brut, parts)
+        
+        # Plafonnement du quotient familial
+        if plafonnement:
+            impot_plafonne = self.calculer_impot(revenus) - (parts - 1) * _PLAFOND_QUOTIENT
+            impot_brut = np.where(parts > 1, np.minimum(impot_brut, impot_plafonne), impot_brut)
+        
+        return np.where(revenus > 0, np.maximum(0, impot_brut), 0.0)
+    
+    def calculer_courbe_taux(self, revenus: np.ndarray, parts: float = 1.0) -> Dict[str, np.ndarray]:
+        """
+        Calcule les taux marginal, moyen et effectif sur une grille de revenus.
+        
+        Args:
+            revenus: Revenus imposables du foyer
+            parts: Nombre de parts fiscales
+            
+        Returns:
+            Dictionnaire revenu, taux_marginal, taux_moyen, taux_effectif
+            (taux nuls pour un revenu nul)
+        """
+        revenus = np.asarray(revenus, dtype=float)
+        quotients = revenus / parts
+        positifs = revenus > 0
+        
+        return {
+            'revenu': revenus,
+            'taux_marginal': np.where(positifs, self.get_taux_marginal(quotients), 0.0),
+            'taux_moyen': np.divide(self.calculer_impot(quotients), quotients,
+                                    out=np.zeros_like(revenus), where=positifs),
+            'taux_effectif': np.divide(self.calculer_impot_net_vec(revenus, parts), revenus,
+                                       out=np.zeros_like(revenus), where=positifs)
+        }
+    
+    def precompute_table(self, revenus: np.ndarray = np.arange(0, 300001, 1000),
+                         parts: np.ndarray = np.arange(0.5, 5.01, 0.5),
+                         persister: bool = True) -> np.ndarray:
+        """
+        Précalcule l'impôt net (décote et plafonnement appliqués) sur une grille.
+        
+        La grille par défaut couvre les valeurs possibles des sliders de l'onglet
+        individuel ; la table est conservée sur l'instance pour impot_net_precalcule.
+        Elle est aussi persistée dans _CACHE_DIR, sous un nom dérivé du barème et
+        de la grille, pour être simplement rechargée aux lancements suivants.
+        
+        Args:
+            revenus: Revenus de la grille (triés)
+            parts: Nombres de parts de la grille (triés)
+            persister: Lire/écrire la table sur disque
             
-        return max(0, impot_brut - decote)
+        Returns:
+            Tableau (len(revenus), len(parts)) des impôts nets
+        """
+        revenus = np.asarray(revenus, dtype=float)
+        parts = np.asarray(parts, dtype=float)
+        
+        table = self._charger_table(revenus, parts) if persister else None
+        if table is None:
+            table = self.calculer_impot_net_vec(revenus[:, None], parts[None, :]).astype(np.float32)
+            if persister:
+                self._sauver_table(table, revenus, parts)
+        
+        self._table = table
+        self._table_revenus = revenus
+        self._table_parts = parts
+        return self._table
+    
+    def _chemin_table(self, revenus: np.ndarray, parts: np.ndarray) -> str:
+        """Chemin du fichier de la table, haché sur tout ce qui détermine son contenu."""
+        empreinte = hashlib.sha1()
+        empreinte.update(np.array([_VERSION_TABLE, _COEF_DECOTE, _PLAFOND_QUOTIENT]).tobytes())
+        for tableau in (self._debuts, self._widths, self._taux,
+                        _DECOTE_PARTS, _DECOTE_SEUILS, revenus, parts):
+            empreinte.update(np.ascontiguousarray(tableau).tobytes())
+        return os.path.join(_CACHE_DIR, f"table_{empreinte.hexdigest()[:16]}.npy")
+    
+    def _charger_table(self, revenus: np.ndarray, parts: np.ndarray) -> Optional[np.ndarray]:
+        """Recharge (en lecture seule, via mmap) une table persistée, sinon None."""
+        chemin = self._chemin_table(revenus, parts)
+        try:
+            table = np.load(chemin, mmap_mode='r')
+        except (OSError, ValueError):
+            return None
+        return table if table.shape == (len(revenus), len(parts)) else None
+    
+    def _sauver_table(self, table: np.ndarray, revenus: np.ndarray, parts: np.ndarray) -> None:
+        """Persiste la table ; un échec d'écriture (disque en lecture seule...) est ignoré."""
+        chemin = self._chemin_table(revenus, parts)
+        try:
+            os.makedirs(_CACHE_DIR, exist_ok=True)
+            # Écriture dans un fichier temporaire puis renommage atomique
+            temporaire = f"{chemin}.{os.getpid()}.tmp"
+            with open(temporaire, 'wb') as fichier:
+                np.save(fichier, table)
+            os.replace(temporaire, chemin)
+        except OSError:
+            pass
+    
+    def impot_net_precalcule(self, revenu: float, parts: float = 1.0) -> float:
+        """
+        Retourne l'impôt net en lisant la table précalculée.
+        
+        La table est construite au premier appel. Hors de la grille, l'impôt
+        est calculé normalement avec calculer_impot_net.
+        """
+        if self._table is None:
+            self.precompute_table()
+        
+        i = np.searchsorted(self._table_revenus, revenu)
+        j = np.searchsorted(self._table_parts, parts)
+        if (i < len(self._table_revenus) and j < len(self._table_parts)
+                and self._table_revenus[i] == revenu and self._table_parts[j] == parts):
+            return float(self._table[i, j])
+        return self.calculer_impot_net(revenu, parts)
+    
+    def _appliquer_decote(self, impot_brut: float, parts: float) -> float:
+        """Applique la décote si applicable (scalaires ou tableaux)."""
+        decote = np.maximum(0, _seuil_decote(parts) - _COEF_DECOTE * impot_brut)
+        impot = np.maximum(0, impot_brut - decote)
+        return float(impot) if np.ndim(impot) == 0 else impot
     
     def _appliquer_plafonnement(self, impot_brut: float, revenu: float, parts: float) -> float:
         """Applique le plafonnement du quotient familial."""
@@ -120,7 +361,7 @@ class BaremeFiscal:
         impot_sans_quotient = self.calculer_impot(revenu)
         
         # Économie maximale
-        economie_max = (parts - 1) * 1850  # 2024
+        economie_max = (parts - 1) * _PLAFOND_QUOTIENT
         
         # Impôt plafonné
         impot_plafonne = impot_sans_quotient - economie_max
@@ -128,6 +369,7 @@ class BaremeFiscal:
         return min(impot_brut, impot_plafonne)
 
 
+@lru_cache(maxsize=1)
 def get_bareme_2024() -> BaremeFiscal:
     """
     Retourne le barème fiscal français 2024 (données officielles).
@@ -135,6 +377,9 @@ def get_bareme_2024() -> BaremeFiscal:
     Source officielle : https://www.impots.gouv.fr/particulier/questions/comment-calculer-mon-taux-dimposition-dapres-le-bareme-progressif-de-limpot
     Date de consultation : Décembre 2024
     Année fiscale : 2024 (revenus de 2023)
+    
+    Le barème est construit une seule fois puis partagé : l'instance
+    retournée ne doit pas être modifiée.
     """
     bareme_data = [
         {'min': 0, 'max': 11497, 'taux': 0.0},      # Jusqu'à 11 497 € : 0%
@@ -146,8 +391,9 @@ def get_bareme_2024() -> BaremeFiscal:
     return BaremeFiscal(bareme_data)
 
 
+@lru_cache(maxsize=1)
 def get_bareme_2025() -> BaremeFiscal:
-    """Retourne le barème fiscal français 2025 (revalorisé)."""
+    """Retourne le barème fiscal français 2025 (revalorisé, instance partagée)."""
     # Revalorisation de 1.4% (inflation estimée)
     facteur = 1.014
     
@@ -161,22 +407,42 @@ def get_bareme_2025() -> BaremeFiscal:
     return BaremeFiscal(bareme_data)
 
 
+# Résultat de calculer_taux_effectif (immuable, donc partageable depuis le cache)
+TauxResult = namedtuple('TauxResult', ['taux_marginal', 'taux_moyen', 'taux_effectif', 'impot_net'])
+
+# Barème par défaut de calculer_taux_effectif, résolu au premier appel
+_DEFAULT_BAREME = None
+
+
 def calculer_taux_effectif(revenu: float, parts: float = 1.0, 
-                          bareme: Optional[BaremeFiscal] = None) -> Dict[str, float]:
+                          bareme: Optional[BaremeFiscal] = None) -> TauxResult:
     """
     Calcule les taux d'imposition pour un revenu donné.
     
+    Les résultats sont mémorisés par (revenu, parts, barème) : les sliders
+    reviennent sans cesse sur les mêmes valeurs discrètes.
+    
     Args:
         revenu: Revenu imposable
         parts: Nombre de parts fiscales
         bareme: Barème à utiliser (défaut: 2024)
         
     Returns:
-        Dictionnaire avec taux_marginal, taux_moyen, taux_effectif
+        TauxResult (taux_marginal, taux_moyen, taux_effectif, impot_net)
     """
+    global _DEFAULT_BAREME
     if bareme is None:
-        bareme = get_bareme_2024()
+        if _DEFAULT_BAREME is None:
+            _DEFAULT_BAREME = get_bareme_2024()
+        bareme = _DEFAULT_BAREME
     
+    return _calculer_taux_effectif_cache(revenu, parts, bareme)
+
+
+@lru_cache(maxsize=4096)
+def _calculer_taux_effectif_cache(revenu: float, parts: float,
+                                  bareme: BaremeFiscal) -> TauxResult:
+    """Calcul mémorisé de calculer_taux_effectif (barème identifié par son instance)."""
     quotient = revenu / parts
     taux_marginal = bareme.get_taux_marginal(quotient)
     taux_moyen = bareme.get_taux_moyen(quotient)
@@ -184,9 +450,4 @@ def calculer_taux_effectif(revenu: float, parts: float = 1.0,
     impot_net = bareme.calculer_impot_net(revenu, parts)
     taux_effectif = impot_net / revenu if revenu > 0 else 0.0
     
-    return {
-        'taux_marginal': taux_marginal,
-        'taux_moyen': taux_moyen,
-        'taux_effectif': taux_effectif,
-        'impot_net': impot_net
-    }
+    return TauxResult(taux_marginal, taux_moyen, taux_effectif, impot_net)
@@ -5,15 +5,203 @@ Ce module contient toutes les fonctions de création de graphiques
 pour l'application Shiny.
 """
 
+import copy
+import os
 import numpy as np
-import pandas as pd
 import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
-from typing import Dict, List, Tuple, Optional, Any
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
-from matplotlib.colors import LinearSegmentedColormap
+import plotly.io as pio
+from plotly.colors import qualitative
+from functools import lru_cache
+from typing import Dict, List, Tuple, Optional, Any, Union
+
+try:
+    from tsdownsample import MinMaxLTTBDownsampler
+except ImportError:  # tsdownsample est optionnel : repli sur l'implémentation NumPy
+    MinMaxLTTBDownsampler = None
+
+
+# FAST_PLOTLY=1 (désactivé par défaut) : les figures des simulations sont retournées
+# sous forme de dicts prêts pour Plotly.js, sans passer par la validation de go.Figure.
+# Sans intérêt si les figures sont ensuite enveloppées dans un go.FigureWidget,
+# qui les valide de toute façon (cas de l'application Shiny)
+_FAST = os.environ.get('FAST_PLOTLY', '0') == '1'
+
+# Figure Plotly validée ou dict brut {'data': [...], 'layout': {...}}
+FigurePlotly = Union[go.Figure, Dict[str, Any]]
+
+# Nombre maximal de points par série transmis à Plotly
+_N_POINTS_MAX = 2500
+
+# Au-delà de ce nombre de points, les courbes sont rendues en WebGL (Scattergl)
+_SEUIL_WEBGL = 2000
+
+# Indicateurs tracés en courbes simples (population, tableau de bord)
+_INDICATEURS_COURBES = ('recettes', 'mobilite_ascendante', 'gini', 'revenu_moyen_global')
+
+# Figures de comparaison : (indicateur, clé de la figure, titre, axe des ordonnées, plage)
+_COMPARAISONS = (
+    ('recettes', 'recettes', "Comparaison des recettes fiscales", "Recettes (€)", None),
+    ('gini', 'gini', "Comparaison de l'inégalité (indice de Gini)", "Indice de Gini", (0, 1)),
+    ('mobilite_ascendante', 'mobilite', "Comparaison de la mobilité ascendante", "Mobilité", None),
+)
+_INDICATEURS_COMPARES = tuple(comparaison[0] for comparaison in _COMPARAISONS)
+
+# Panneaux du tableau de bord, dans l'ordre de la grille 2x2 : (indicateur, nom, titre)
+_DASHBOARD_PANNEAUX = (
+    ('recettes', 'Recettes', 'Recettes fiscales'),
+    ('gini', 'Gini', 'Indice de Gini'),
+    ('mobilite_ascendante', 'Mobilité', 'Mobilité ascendante'),
+    ('revenu_moyen_global', 'Revenu moyen', 'Revenu moyen global'),
+)
+
+# Gabarit commun des courbes : plotly_white avec survol unifié sur l'axe des abscisses,
+# enregistré une fois au chargement du module
+_TEMPLATE_FISCAL = go.layout.Template(pio.templates['plotly_white'])
+_TEMPLATE_FISCAL.layout.hovermode = 'x unified'
+pio.templates['fiscal'] = _TEMPLATE_FISCAL
+
+# Taille maximale (en cellules par côté) des heatmaps transmises au navigateur
+_TAILLE_HEATMAP_MAX = 80
+
+# Au-delà de cette taille, les valeurs ne sont plus écrites dans les cellules
+_SEUIL_TEXTE_HEATMAP = 30
+
+
+@lru_cache(maxsize=8)
+def _template_json(nom: str) -> Dict[str, Any]:
+    """Gabarit enregistré sous forme de dict, Plotly.js ne connaissant pas les gabarits nommés."""
+    return pio.templates[nom].to_plotly_json()
+
+
+def _figure(data: List[Dict], layout: Dict) -> FigurePlotly:
+    """
+    Assemble une figure à partir de traces et d'une mise en page sous forme de dicts.
+    
+    Args:
+        data: Liste des traces
+        layout: Mise en page
+        
+    Returns:
+        Dict brut si _FAST (aucune validation, le gabarit nommé est développé),
+        go.Figure sinon
+    """
+    if not _FAST:
+        return go.Figure(data=data, layout=layout)
+    # Copie profonde : la mise en page peut provenir d'un état partagé du module
+    # (_DASHBOARD_LAYOUT, gabarit mémorisé), qu'un appelant ne doit pas pouvoir altérer
+    layout = copy.deepcopy(layout)
+    if isinstance(layout.get('template'), str):
+        layout['template'] = copy.deepcopy(_template_json(layout['template']))
+    return dict(data=data, layout=layout)
+
+
+def _indices_lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Sélectionne n_out indices par l'algorithme LTTB (Largest Triangle Three Buckets).
+    
+    Les extrémités sont conservées ; dans chaque seau, on garde le point qui forme
+    le plus grand triangle avec le point retenu précédemment et la moyenne du seau
+    suivant, ce qui préserve pics et creux de la série.
+    """
+    n = len(x)
+    if MinMaxLTTBDownsampler is not None:
+        return MinMaxLTTBDownsampler().downsample(x, y, n_out=n_out)
+    
+    bornes = np.linspace(1, n - 1, n_out - 1).astype(int)
+    indices = np.empty(n_out, dtype=int)
+    indices[0], indices[-1] = 0, n - 1
+    
+    a = 0
+    for i in range(n_out - 2):
+        debut, fin = bornes[i], bornes[i + 1]
+        # Point de référence : moyenne du seau suivant (ou dernier point)
+        if i < n_out - 3:
+            x_suivant = x[bornes[i + 1]:bornes[i + 2]].mean()
+            y_suivant = y[bornes[i + 1]:bornes[i + 2]].mean()
+        else:
+            x_suivant, y_suivant = x[-1], y[-1]
+        
+        aires = np.abs((x[a] - x_suivant) * (y[debut:fin] - y[a])
+                       - (x[a] - x[debut:fin]) * (y_suivant - y[a]))
+        a = debut + int(np.argmax(aires))
+        indices[i + 1] = a
+    
+    return indices
+
+
+def _type_scatter(n_points: int) -> str:
+    """Retourne le type de trace 'scattergl' (rendu WebGL) pour les longues séries, 'scatter' (SVG) sinon."""
+    return 'scattergl' if n_points > _SEUIL_WEBGL else 'scatter'
+
+
+def _downsample(x, y, n_out: int = _N_POINTS_MAX) -> Tuple[np.ndarray, np.ndarray]:
+    """Réduit une série à n_out points (LTTB) ; les séries courtes sont renvoyées telles quelles."""
+    x = np.ascontiguousarray(x, dtype=float)
+    y = np.ascontiguousarray(y, dtype=float)
+    if len(x) <= n_out:
+        return x, y
+    indices = _indices_lttb(x, y, n_out)
+    return x[indices], y[indices]
+
+
+def _series_listes(temps, indicateurs: Dict, cles: Tuple[str, ...]) -> Dict[str, Tuple[list, list]]:
+    """
+    Réduit (LTTB) puis convertit en listes plusieurs séries partageant les mêmes abscisses.
+    
+    Les listes sont passées telles quelles aux traces : Plotly n'a plus à convertir
+    un tableau NumPy par trace. Sans réduction, la liste des abscisses est construite
+    une seule fois et partagée par toutes les séries.
+    
+    Args:
+        temps: Abscisses communes
+        indicateurs: Dictionnaire des séries
+        cles: Séries à convertir
+        
+    Returns:
+        Dictionnaire cle -> (abscisses, ordonnées) sous forme de listes
+    """
+    temps = np.ascontiguousarray(temps, dtype=float)
+    if len(temps) <= _N_POINTS_MAX:
+        temps_liste = temps.tolist()
+        return {cle: (temps_liste, np.asarray(indicateurs[cle], dtype=float).tolist())
+                for cle in cles}
+    
+    series = {}
+    for cle in cles:
+        x, y = _downsample(temps, indicateurs[cle])
+        series[cle] = (x.tolist(), y.tolist())
+    return series
+
+
+@lru_cache(maxsize=256)
+def _courbe_taux_cache(bareme, revenu_max: float, parts: float,
+                       n_points: int = 1000) -> Dict[str, np.ndarray]:
+    """
+    Courbe des taux mémorisée par (barème, revenu_max, parts), partagée entre sessions.
+    
+    Les tableaux retournés sont en lecture seule.
+    """
+    courbe = bareme.calculer_courbe_taux(np.linspace(0, revenu_max, n_points), parts)
+    for tableau in courbe.values():
+        tableau.setflags(write=False)
+    return courbe
+
+
+@lru_cache(maxsize=256)
+def _courbe_impots_cache(bareme, revenu_max: float, parts: float,
+                         n_points: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Courbe de l'impôt net mémorisée ; les tableaux retournés sont en lecture seule."""
+    revenus = np.linspace(0, revenu_max, n_points)
+    impots = bareme.calculer_impot_net_vec(revenus, parts)
+    revenus.setflags(write=False)
+    impots.setflags(write=False)
+    return revenus, impots
+
+
+@lru_cache(maxsize=256)
+def _etiquettes_euros(montants: Tuple[float, ...]) -> Tuple[str, ...]:
+    """Étiquettes « 1,234€ » mémorisées pour un tuple de montants."""
+    return tuple(f"{montant:,.0f}€" for montant in montants)
 
 
 def create_tax_plots(calculator, revenu: float, parts: float = 1.0) -> Dict[str, go.Figure]:
@@ -30,36 +218,48 @@ def create_tax_plots(calculator, revenu: float, parts: float = 1.0) -> Dict[str,
     """
     # Calcul des données
     resultat = calculator.calculer_impot_complet(revenu, parts)
-    courbe_taux = calculator.generer_courbe_taux(revenu_max=revenu*2, parts=parts)
+    
+    # Courbes mémorisées, borne arrondie à 100 € pour partager les entrées du cache
+    revenu_max = round(revenu * 2, -2)
+    courbe_taux = _courbe_taux_cache(calculator.bareme, revenu_max, parts)
     
     figures = {}
     
     # 1. Graphique des taux (marginal, moyen, effectif)
-    fig_taux = go.Figure()
-    
-    fig_taux.add_trace(go.Scatter(
-        x=courbe_taux['revenu'],
-        y=courbe_taux['taux_marginal'] * 100,
-        mode='lines',
-        name='Taux marginal',
-        line=dict(color='red', width=2)
-    ))
-    
-    fig_taux.add_trace(go.Scatter(
-        x=courbe_taux['revenu'],
-        y=courbe_taux['taux_moyen'] * 100,
-        mode='lines',
-        name='Taux moyen',
-        line=dict(color='blue', width=2)
-    ))
-    
-    fig_taux.add_trace(go.Scatter(
-        x=courbe_taux['revenu'],
-        y=courbe_taux['taux_effectif'] * 100,
-        mode='lines',
-        name='Taux effectif',
-        line=dict(color='green', width=2)
-    ))
+    fig_taux = go.Figure(
+        data=[
+            dict(
+                type='scatter',
+                x=courbe_taux['revenu'],
+                y=courbe_taux['taux_marginal'] * 100,
+                mode='lines',
+                name='Taux marginal',
+                line=dict(color='red', width=2)
+            ),
+            dict(
+                type='scatter',
+                x=courbe_taux['revenu'],
+                y=courbe_taux['taux_moyen'] * 100,
+                mode='lines',
+                name='Taux moyen',
+                line=dict(color='blue', width=2)
+            ),
+            dict(
+                type='scatter',
+                x=courbe_taux['revenu'],
+                y=courbe_taux['taux_effectif'] * 100,
+                mode='lines',
+                name='Taux effectif',
+                line=dict(color='green', width=2)
+            )
+        ],
+        layout=dict(
+            title="Évolution des taux d'imposition",
+            xaxis_title="Revenu (€)",
+            yaxis_title="Taux (%)",
+            template="fiscal"
+        )
+    )
     
     # Ligne verticale pour le revenu actuel
     fig_taux.add_vline(
@@ -69,77 +269,94 @@ def create_tax_plots(calculator, revenu: float, parts: float = 1.0) -> Dict[str,
         annotation_text=f"Revenu: {revenu:,.0f}€"
     )
     
-    fig_taux.update_layout(
-        title="Évolution des taux d'imposition",
-        xaxis_title="Revenu (€)",
-        yaxis_title="Taux (%)",
-        hovermode='x unified',
-        template="plotly_white"
-    )
-    
     figures['taux'] = fig_taux
     
     # 2. Graphique en barres du détail par tranche
-    if resultat['detail_tranches']:
-        detail_df = pd.DataFrame(resultat['detail_tranches'])
-        
-        fig_tranches = go.Figure()
-        
-        fig_tranches.add_trace(go.Bar(
-            x=detail_df['tranche'],
-            y=detail_df['impot'],
-            name='Impôt par tranche',
-            marker_color='lightblue',
-            text=[f"{impot:,.0f}€" for impot in detail_df['impot']],
-            textposition='auto'
-        ))
-        
-        fig_tranches.update_layout(
-            title="Répartition de l'impôt par tranche",
-            xaxis_title="Tranche de revenu",
-            yaxis_title="Montant d'impôt (€)",
-            template="plotly_white"
+    detail = resultat['detail_tranches']
+    if len(detail['impot']) > 0:
+        # Le détail est déjà stocké par colonnes : pas de DataFrame intermédiaire
+        fig_tranches = go.Figure(
+            data=[dict(
+                type='bar',
+                x=detail['tranche'],
+                y=detail['impot'],
+                name='Impôt par tranche',
+                marker_color='lightblue',
+                text=_etiquettes_euros(tuple(detail['impot'].tolist())),
+                textposition='auto'
+            )],
+            layout=dict(
+                title="Répartition de l'impôt par tranche",
+                xaxis_title="Tranche de revenu",
+                yaxis_title="Montant d'impôt (€)",
+                template="plotly_white"
+            )
         )
         
         figures['tranches'] = fig_tranches
     
     # 3. Graphique de l'impôt en fonction du revenu
-    revenus_test = np.linspace(0, revenu*2, 200)
-    impots = [calculator.bareme.calculer_impot_net(r, parts) for r in revenus_test]
-    
-    fig_impot = go.Figure()
-    
-    fig_impot.add_trace(go.Scatter(
-        x=revenus_test,
-        y=impots,
-        mode='lines',
-        name='Impôt net',
-        line=dict(color='purple', width=3),
-        fill='tonexty'
-    ))
-    
-    # Point pour le revenu actuel
-    fig_impot.add_trace(go.Scatter(
-        x=[revenu],
-        y=[resultat['impot_net']],
-        mode='markers',
-        name='Votre situation',
-        marker=dict(color='red', size=10, symbol='diamond')
-    ))
-    
-    fig_impot.update_layout(
-        title="Évolution de l'impôt en fonction du revenu",
-        xaxis_title="Revenu (€)",
-        yaxis_title="Impôt net (€)",
-        template="plotly_white"
+    revenus_test, impots = _courbe_impots_cache(calculator.bareme, revenu_max, parts, 200)
+    
+    figures['impot'] = go.Figure(
+        data=[
+            dict(
+                type='scatter',
+                x=revenus_test,
+                y=impots,
+                mode='lines',
+                name='Impôt net',
+                line=dict(color='purple', width=3),
+                fill='tonexty'
+            ),
+            # Point pour le revenu actuel
+            dict(
+                type='scatter',
+                x=[revenu],
+                y=[resultat['impot_net']],
+                mode='markers',
+                name='Votre situation',
+                marker=dict(color='red', size=10, symbol='diamond')
+            )
+        ],
+        layout=dict(
+            title="Évolution de l'impôt en fonction du revenu",
+            xaxis_title="Revenu (€)",
+            yaxis_title="Impôt net (€)",
+            template="fiscal"
+        )
     )
     
-    figures['impot'] = fig_impot
-    
     return figures
 
 
-def create_population_plots(resultats: Dict, mode: str = 'ode') -> Dict[str, go.Figure]:
+def _layout_courbe(titre: str, axe_x: str, axe_y: str,
+                   plage_y: Optional[Tuple[float, float]] = None) -> Dict[str, Any]:
+    """
+    Mise en page d'une figure de courbes, en clés imbriquées comprises par Plotly.js
+    (et non les raccourcis xaxis_title... propres à plotly.py).
+    
+    Args:
+        titre: Titre de la figure
+        axe_x: Titre de l'axe des abscisses
+        axe_y: Titre de l'axe des ordonnées
+        plage_y: Plage fixe de l'axe des ordonnées
+        
+    Returns:
+        Dictionnaire de layout
+    """
+    yaxis = dict(title=dict(text=axe_y))
+    if plage_y is not None:
+        yaxis['range'] = list(plage_y)
+    return dict(
+        title=dict(text=titre),
+        xaxis=dict(title=dict(text=axe_x)),
+        yaxis=yaxis,
+        template="fiscal"
+    )
+
+
+def create_population_plots(resultats: Dict, mode: str = 'ode') -> Dict[str, FigurePlotly]:
     """
     Crée les graphiques pour la simulation populationnelle.
     
@@ -148,7 +365,7 @@ def create_population_plots(resultats: Dict, mode: str = 'ode') -> Dict[str, go.
         mode: Mode de simulation ('ode' ou 'markov')
         
     Returns:
-        Dictionnaire avec les figures Plotly
+        Dictionnaire avec les figures Plotly (dicts bruts si FAST_PLOTLY)
     """
     figures = {}
     
@@ -164,120 +381,111 @@ def create_population_plots(resultats: Dict, mode: str = 'ode') -> Dict[str, go.
     n_tranches = population.shape[0]
     
     # 1. Graphique en aires empilées de la répartition
-    fig_aires = go.Figure()
-    
-    couleurs = px.colors.qualitative.Set3[:n_tranches]
-    
-    for i in range(n_tranches):
-        fig_aires.add_trace(go.Scatter(
-            x=temps,
-            y=population[i, :],
-            mode='lines',
-            name=f'Tranche {i+1}',
-            stackgroup='one',
-            fillcolor=couleurs[i],
-            line=dict(width=0.5)
-        ))
-    
-    fig_aires.update_layout(
-        title="Évolution de la répartition de la population",
-        xaxis_title="Temps",
-        yaxis_title="Population",
-        hovermode='x unified',
-        template="plotly_white"
+    couleurs = tuple(qualitative.Set3[:n_tranches])
+    
+    # Les aires empilées doivent partager les mêmes abscisses : indices LTTB
+    # choisis sur la population totale puis appliqués à chaque tranche
+    temps_aires = np.asarray(temps, dtype=float)
+    population_aires = np.asarray(population)
+    if len(temps_aires) > _N_POINTS_MAX:
+        indices = _indices_lttb(temps_aires, population_aires.sum(axis=0), _N_POINTS_MAX)
+        temps_aires = temps_aires[indices]
+        population_aires = population_aires[:, indices]
+    
+    # Conversion en listes une seule fois (abscisses partagées, un seul
+    # tolist() pour toutes les tranches) plutôt qu'une par trace dans Plotly
+    x_aires = temps_aires.tolist()
+    y_tranches = population_aires.tolist()
+    
+    # Traces et mise en page passées en une fois au constructeur : une seule
+    # validation au lieu d'un add_trace/update_layout par élément
+    figures['aires'] = _figure(
+        data=[
+            dict(
+                type='scatter',
+                x=x_aires,
+                y=y_tranche,
+                mode='lines',
+                name=f'Tranche {i+1}',
+                stackgroup='one',
+                fillcolor=couleur,
+                line=dict(width=0.5)
+            )
+            for i, (y_tranche, couleur) in enumerate(zip(y_tranches, couleurs, strict=True))
+        ],
+        layout=_layout_courbe("Évolution de la répartition de la population", "Temps", "Population")
     )
     
-    figures['aires'] = fig_aires
+    # Courbes simples en WebGL pour les longues simulations (pas les aires :
+    # Scattergl ne gère pas stackgroup)
+    type_scatter = _type_scatter(len(temps))
+    series = _series_listes(temps, indicateurs, _INDICATEURS_COURBES)
     
     # 2. Graphique des recettes fiscales
-    fig_recettes = go.Figure()
-    
-    fig_recettes.add_trace(go.Scatter(
-        x=temps,
-        y=indicateurs['recettes'],
-        mode='lines+markers',
-        name='Recettes fiscales',
-        line=dict(color='green', width=3),
-        marker=dict(size=4)
-    ))
-    
-    fig_recettes.update_layout(
-        title="Évolution des recettes fiscales",
-        xaxis_title="Temps",
-        yaxis_title="Recettes (€)",
-        template="plotly_white"
+    x, y = series['recettes']
+    figures['recettes'] = _figure(
+        data=[dict(
+            type=type_scatter,
+            x=x,
+            y=y,
+            mode='lines+markers',
+            name='Recettes fiscales',
+            line=dict(color='green', width=3),
+            marker=dict(size=4)
+        )],
+        layout=_layout_courbe("Évolution des recettes fiscales", "Temps", "Recettes (€)")
     )
     
-    figures['recettes'] = fig_recettes
-    
     # 3. Graphique de la mobilité ascendante
-    fig_mobilite = go.Figure()
-    
-    fig_mobilite.add_trace(go.Scatter(
-        x=temps,
-        y=indicateurs['mobilite_ascendante'],
-        mode='lines+markers',
-        name='Mobilité ascendante',
-        line=dict(color='orange', width=3),
-        marker=dict(size=4)
-    ))
-    
-    fig_mobilite.update_layout(
-        title="Évolution de la mobilité ascendante",
-        xaxis_title="Temps",
-        yaxis_title="Mobilité",
-        template="plotly_white"
+    x, y = series['mobilite_ascendante']
+    figures['mobilite'] = _figure(
+        data=[dict(
+            type=type_scatter,
+            x=x,
+            y=y,
+            mode='lines+markers',
+            name='Mobilité ascendante',
+            line=dict(color='orange', width=3),
+            marker=dict(size=4)
+        )],
+        layout=_layout_courbe("Évolution de la mobilité ascendante", "Temps", "Mobilité")
     )
     
-    figures['mobilite'] = fig_mobilite
-    
     # 4. Graphique de l'indice de Gini
-    fig_gini = go.Figure()
-    
-    fig_gini.add_trace(go.Scatter(
-        x=temps,
-        y=indicateurs['gini'],
-        mode='lines+markers',
-        name='Indice de Gini',
-        line=dict(color='red', width=3),
-        marker=dict(size=4)
-    ))
-    
-    fig_gini.update_layout(
-        title="Évolution de l'inégalité (indice de Gini)",
-        xaxis_title="Temps",
-        yaxis_title="Indice de Gini",
-        yaxis=dict(range=[0, 1]),
-        template="plotly_white"
+    x, y = series['gini']
+    figures['gini'] = _figure(
+        data=[dict(
+            type=type_scatter,
+            x=x,
+            y=y,
+            mode='lines+markers',
+            name='Indice de Gini',
+            line=dict(color='red', width=3),
+            marker=dict(size=4)
+        )],
+        layout=_layout_courbe("Évolution de l'inégalité (indice de Gini)", "Temps",
+                              "Indice de Gini", plage_y=(0, 1))
     )
     
-    figures['gini'] = fig_gini
-    
     # 5. Graphique du revenu moyen global
-    fig_revenu = go.Figure()
-    
-    fig_revenu.add_trace(go.Scatter(
-        x=temps,
-        y=indicateurs['revenu_moyen_global'],
-        mode='lines+markers',
-        name='Revenu moyen global',
-        line=dict(color='blue', width=3),
-        marker=dict(size=4)
-    ))
-    
-    fig_revenu.update_layout(
-        title="Évolution du revenu moyen global",
-        xaxis_title="Temps",
-        yaxis_title="Revenu moyen (€)",
-        template="plotly_white"
+    x, y = series['revenu_moyen_global']
+    figures['revenu'] = _figure(
+        data=[dict(
+            type=type_scatter,
+            x=x,
+            y=y,
+            mode='lines+markers',
+            name='Revenu moyen global',
+            line=dict(color='blue', width=3),
+            marker=dict(size=4)
+        )],
+        layout=_layout_courbe("Évolution du revenu moyen global", "Temps", "Revenu moyen (€)")
     )
     
-    figures['revenu'] = fig_revenu
-    
     return figures
 
 
-def create_comparison_plots(resultats_comparaison: Dict) -> Dict[str, go.Figure]:
+def create_comparison_plots(resultats_comparaison: Dict) -> Dict[str, FigurePlotly]:
     """
     Crée les graphiques de comparaison entre scénarios.
     
@@ -285,139 +493,69 @@ def create_comparison_plots(resultats_comparaison: Dict) -> Dict[str, go.Figure]
         resultats_comparaison: Résultats de comparaison
         
     Returns:
-        Dictionnaire avec les figures Plotly
+        Dictionnaire avec les figures Plotly (dicts bruts si FAST_PLOTLY)
     """
     figures = {}
     
     # Données de base
     temps_base = resultats_comparaison['base']['temps']
     indicateurs_base = resultats_comparaison['base']['indicateurs']
-    
-    # Données avec choc/redistribution
-    if 'choc' in resultats_comparaison:
-        temps_choc = resultats_comparaison['choc']['temps']
-        indicateurs_choc = resultats_comparaison['choc']['indicateurs']
+    series_base = _series_listes(temps_base, indicateurs_base, _INDICATEURS_COMPARES)
+    
+    # Scénario alternatif (choc/redistribution), déterminé une seule fois ;
+    # sans scénario alternatif, seules les courbes de base sont tracées
+    alt = next((cle for cle in ('choc', 'redistribution') if cle in resultats_comparaison), None)
+    alt_couleur = {'choc': 'red', 'redistribution': 'green'}.get(alt)
+    scenario_nom = None
+    series_alt = None
+    if alt == 'choc':
         scenario_nom = f"Choc fiscal (+{resultats_comparaison['delta_tau']*100:.1f}%)"
-    elif 'redistribution' in resultats_comparaison:
-        temps_redist = resultats_comparaison['redistribution']['temps']
-        indicateurs_redist = resultats_comparaison['redistribution']['indicateurs']
+    elif alt == 'redistribution':
         scenario_nom = f"Redistribution (ρ={resultats_comparaison['rho']:.2f})"
-    
-    # 1. Comparaison des recettes fiscales
-    fig_recettes = go.Figure()
-    
-    fig_recettes.add_trace(go.Scatter(
-        x=temps_base,
-        y=indicateurs_base['recettes'],
-        mode='lines',
-        name='Scénario de base',
-        line=dict(color='blue', width=3)
-    ))
-    
-    if 'choc' in resultats_comparaison:
-        fig_recettes.add_trace(go.Scatter(
-            x=temps_choc,
-            y=indicateurs_choc['recettes'],
-            mode='lines',
-            name=scenario_nom,
-            line=dict(color='red', width=3)
-        ))
-    elif 'redistribution' in resultats_comparaison:
-        fig_recettes.add_trace(go.Scatter(
-            x=temps_redist,
-            y=indicateurs_redist['recettes'],
+    if alt is not None:
+        series_alt = _series_listes(resultats_comparaison[alt]['temps'],
+                                    resultats_comparaison[alt]['indicateurs'],
+                                    _INDICATEURS_COMPARES)
+    
+    # Rendu WebGL pour les longues simulations (les scénarios partagent l'horizon de la base)
+    type_scatter = _type_scatter(len(temps_base))
+    
+    # Une figure par indicateur : scénario de base puis scénario alternatif
+    for cle, figure, titre, axe_y, plage_y in _COMPARAISONS:
+        x, y = series_base[cle]
+        traces = [dict(
+            type=type_scatter,
+            x=x,
+            y=y,
             mode='lines',
-            name=scenario_nom,
-            line=dict(color='green', width=3)
-        ))
-    
-    fig_recettes.update_layout(
-        title="Comparaison des recettes fiscales",
-        xaxis_title="Temps",
-        yaxis_title="Recettes (€)",
-        template="plotly_white"
-    )
-    
-    figures['recettes'] = fig_recettes
-    
-    # 2. Comparaison de l'indice de Gini
-    fig_gini = go.Figure()
-    
-    fig_gini.add_trace(go.Scatter(
-        x=temps_base,
-        y=indicateurs_base['gini'],
-        mode='lines',
-        name='Scénario de base',
-        line=dict(color='blue', width=3)
-    ))
-    
-    if 'choc' in resultats_comparaison:
-        fig_gini.add_trace(go.Scatter(
-            x=temps_choc,
-            y=indicateurs_choc['gini'],
-            mode='lines',
-            name=scenario_nom,
-            line=dict(color='red', width=3)
-        ))
-    elif 'redistribution' in resultats_comparaison:
-        fig_gini.add_trace(go.Scatter(
-            x=temps_redist,
-            y=indicateurs_redist['gini'],
-            mode='lines',
-            name=scenario_nom,
-            line=dict(color='green', width=3)
-        ))
-    
-    fig_gini.update_layout(
-        title="Comparaison de l'inégalité (indice de Gini)",
-        xaxis_title="Temps",
-        yaxis_title="Indice de Gini",
-        yaxis=dict(range=[0, 1]),
-        template="plotly_white"
-    )
-    
-    figures['gini'] = fig_gini
-    
-    # 3. Comparaison de la mobilité ascendante
-    fig_mobilite = go.Figure()
-    
-    fig_mobilite.add_trace(go.Scatter(
-        x=temps_base,
-        y=indicateurs_base['mobilite_ascendante'],
-        mode='lines',
-        name='Scénario de base',
-        line=dict(color='blue', width=3)
-    ))
-    
-    if 'choc' in resultats_comparaison:
-        fig_mobilite.add_trace(go.Scatter(
-            x=temps_choc,
-            y=indicateurs_choc['mobilite_ascendante'],
-            mode='lines',
-            name=scenario_nom,
-            line=dict(color='red', width=3)
-        ))
-    elif 'redistribution' in resultats_comparaison:
-        fig_mobilite.add_trace(go.Scatter(
-            x=temps_redist,
-            y=indicateurs_redist['mobilite_ascendante'],
-            mode='lines',
-            name=scenario_nom,
-            line=dict(color='green', width=3)
-        ))
-    
-    fig_mobilite.update_layout(
-        title="Comparaison de la mobilité ascendante",
-        xaxis_title="Temps",
-        yaxis_title="Mobilité",
-        template="plotly_white"
-    )
-    
-    figures['mobilite'] = fig_mobilite
+            name='Scénario de base',
+            line=dict(color='blue', width=3)
+        )]
+        
+        if alt is not None:
+            x, y = series_alt[cle]
+            traces.append(dict(
+                type=type_scatter,
+                x=x,
+                y=y,
+                mode='lines',
+                name=scenario_nom,
+                line=dict(color=alt_couleur, width=3)
+            ))
+        
+        figures[figure] = _figure(data=traces,
+                                  layout=_layout_courbe(titre, "Temps", axe_y, plage_y))
     
     return figures
 
 
+@lru_cache(maxsize=64)
+def _couleur_taux(taux_pct: int) -> str:
+    """Couleur rgba d'une tranche, du vert (0 %) au rouge (100 %), mémorisée par taux entier en %."""
+    taux = taux_pct / 100
+    return f"rgba({int(255*taux)}, {int(255*(1-taux))}, 0, 0.7)"
+
+
 def create_barème_plot(bareme) -> go.Figure:
     """
     Crée un graphique du barème fiscal.
@@ -428,45 +566,57 @@ def create_barème_plot(bareme) -> go.Figure:
     Returns:
         Figure Plotly du barème
     """
-    fig = go.Figure()
-    
-    # Créer les rectangles pour chaque tranche
-    for _, tranche in bareme.bareme.iterrows():
-        if tranche['max'] == np.inf:
-            largeur = 100000  # Largeur arbitraire pour la dernière tranche
-        else:
-            largeur = tranche['max'] - tranche['min']
-        
-        fig.add_shape(
-            type="rect",
-            x0=tranche['min'],
-            y0=0,
-            x1=tranche['min'] + largeur,
-            y1=tranche['taux'] * 100,
-            fillcolor=f"rgba({int(255*tranche['taux'])}, {int(255*(1-tranche['taux']))}, 0, 0.7)",
+    # Colonnes du barème en tableaux : une seule trace Bar pour toutes les
+    # tranches au lieu d'un add_shape/add_annotation par tranche
+    mins = bareme._mins.astype(float)
+    maxs = bareme._maxs.astype(float)
+    taux = bareme._taux
+    maxs[np.isinf(maxs)] = mins[-1] + 100000  # Largeur arbitraire pour la dernière tranche
+    largeurs = maxs - mins
+    
+    fig = go.Figure(go.Bar(
+        x=mins + largeurs / 2,
+        y=taux * 100,
+        width=largeurs,
+        text=[f"{t*100:.1f}%" for t in taux],
+        textposition='inside',
+        insidetextanchor='middle',
+        textfont=dict(size=12, color=["white" if t > 0.3 else "black" for t in taux]),
+        marker=dict(
+            color=[_couleur_taux(int(round(t * 100))) for t in taux],
             line=dict(color="black", width=1)
-        )
-        
-        # Ajouter le texte du taux
-        fig.add_annotation(
-            x=tranche['min'] + largeur/2,
-            y=tranche['taux'] * 100/2,
-            text=f"{tranche['taux']*100:.1f}%",
-            showarrow=False,
-            font=dict(size=12, color="white" if tranche['taux'] > 0.3 else "black")
-        )
-    
-    fig.update_layout(
+        ),
+        showlegend=False
+    ), layout=dict(
         title="Barème fiscal français",
         xaxis_title="Revenu (€)",
         yaxis_title="Taux d'imposition (%)",
         template="plotly_white",
         height=400
-    )
+    ))
     
     return fig
 
 
+def _reduire_par_blocs(matrice: np.ndarray, k: int) -> np.ndarray:
+    """
+    Agrège une matrice par blocs k x k (moyenne), les blocs du bord pouvant être incomplets.
+    
+    Args:
+        matrice: Matrice 2D à réduire
+        k: Côté des blocs
+        
+    Returns:
+        Matrice de taille ceil(n/k) x ceil(m/k)
+    """
+    n, m = matrice.shape
+    n_blocs, m_blocs = -(-n // k), -(-m // k)
+    # Complétion par NaN jusqu'à un multiple de k, ignorée par nanmean
+    complete = np.full((n_blocs * k, m_blocs * k), np.nan)
+    complete[:n, :m] = matrice
+    return np.nanmean(complete.reshape(n_blocs, k, m_blocs, k), axis=(1, 3))
+
+
 def create_heatmap_mobilite(matrice_generateur: np.ndarray) -> go.Figure:
     """
     Crée une heatmap de la matrice de générateur.
@@ -477,27 +627,90 @@ def create_heatmap_mobilite(matrice_generateur: np.ndarray) -> go.Figure:
     Returns:
         Figure Plotly de la heatmap
     """
+    matrice = np.asarray(matrice_generateur, dtype=float)
+    n = matrice.shape[0]
+    etats = np.arange(n)
+    
+    # Grandes matrices : moyenne par blocs pour ne pas dépasser
+    # _TAILLE_HEATMAP_MAX cellules par côté, chaque bloc étant repéré par son premier état
+    if n > _TAILLE_HEATMAP_MAX:
+        k = -(-n // _TAILLE_HEATMAP_MAX)
+        matrice = _reduire_par_blocs(matrice, k)
+        etats = etats[::k]
+    
+    # Une étiquette par cellule alourdit fortement le rendu : seulement pour les petites matrices
+    if n > _SEUIL_TEXTE_HEATMAP:
+        etiquettes = {}
+    else:
+        etiquettes = dict(
+            text=np.round(matrice, 3),
+            texttemplate="%{text}",
+            textfont={"size": 10}
+        )
+    
     fig = go.Figure(data=go.Heatmap(
-        z=matrice_generateur,
+        z=matrice,
+        x=etats,
+        y=etats,
         colorscale='RdBu',
         zmid=0,
-        text=np.round(matrice_generateur, 3),
-        texttemplate="%{text}",
-        textfont={"size": 10},
-        hoverongaps=False
-    ))
-    
-    fig.update_layout(
+        hoverongaps=False,
+        **etiquettes
+    ), layout=dict(
         title="Matrice de générateur (intensités de transition)",
         xaxis_title="État d'arrivée",
         yaxis_title="État de départ",
         template="plotly_white"
-    )
+    ))
     
     return fig
 
 
-def create_dashboard_summary(resultats: Dict) -> go.Figure:
+def _suffixe_axe(numero: int) -> str:
+    """Suffixe Plotly.js du numero-ième axe : '' pour le premier (xaxis, 'x'), puis '2', '3'..."""
+    return '' if numero == 1 else str(numero)
+
+
+def _creer_dashboard_layout() -> Dict:
+    """
+    Mise en page du tableau de bord : mêmes domaines d'axes et titres de panneaux
+    que make_subplots(rows=2, cols=2).
+    
+    Returns:
+        Dictionnaire de layout Plotly
+    """
+    layout = dict(
+        title=dict(text="Tableau de bord - Indicateurs clés"),
+        template="fiscal",
+        height=600,
+        showlegend=False,
+        annotations=[]
+    )
+    for numero, (_, _, titre) in enumerate(_DASHBOARD_PANNEAUX, start=1):
+        domaine_x = [0.0, 0.45] if numero % 2 else [0.55, 1.0]
+        domaine_y = [0.625, 1.0] if numero <= 2 else [0.0, 0.375]
+        suffixe = _suffixe_axe(numero)
+        layout[f'xaxis{suffixe}'] = dict(domain=domaine_x, anchor=f'y{suffixe}')
+        layout[f'yaxis{suffixe}'] = dict(domain=domaine_y, anchor=f'x{suffixe}')
+        layout['annotations'].append(dict(
+            text=titre,
+            x=sum(domaine_x) / 2,
+            y=domaine_y[1],
+            xref='paper',
+            yref='paper',
+            xanchor='center',
+            yanchor='bottom',
+            showarrow=False,
+            font=dict(size=16)
+        ))
+    return layout
+
+
+# Calculée une seule fois au chargement du module
+_DASHBOARD_LAYOUT = _creer_dashboard_layout()
+
+
+def create_dashboard_summary(resultats: Dict) -> FigurePlotly:
     """
     Crée un tableau de bord résumé avec plusieurs indicateurs.
     
@@ -505,49 +718,25 @@ def create_dashboard_summary(resultats: Dict) -> go.Figure:
         resultats: Résultats de simulation
         
     Returns:
-        Figure Plotly du dashboard
+        Figure Plotly du dashboard (dict brut si FAST_PLOTLY)
     """
-    # Créer un subplot avec 2x2 graphiques
-    fig = make_subplots(
-        rows=2, cols=2,
-        subplot_titles=('Recettes fiscales', 'Indice de Gini', 
-                       'Mobilité ascendante', 'Revenu moyen global'),
-        specs=[[{"secondary_y": False}, {"secondary_y": False}],
-               [{"secondary_y": False}, {"secondary_y": False}]]
-    )
-    
     temps = resultats['temps']
     indicateurs = resultats['indicateurs']
+    type_scatter = _type_scatter(len(temps))
+    series = _series_listes(temps, indicateurs, _INDICATEURS_COURBES)
+    
+    # Grille 2x2 déclarée une fois dans _DASHBOARD_LAYOUT : chaque trace
+    # référence directement ses axes, sans passer par make_subplots
+    traces = []
+    for numero, (cle, nom, _) in enumerate(_DASHBOARD_PANNEAUX, start=1):
+        x, y = series[cle]
+        traces.append(dict(
+            type=type_scatter,
+            x=x,
+            y=y,
+            name=nom,
+            xaxis=f'x{_suffixe_axe(numero)}',
+            yaxis=f'y{_suffixe_axe(numero)}'
+        ))
     
-    # Recettes fiscales
-    fig.add_trace(
-        go.Scatter(x=temps, y=indicateurs['recettes'], name='Recettes'),
-        row=1, col=1
-    )
-    
-    # Indice de Gini
-    fig.add_trace(
-        go.Scatter(x=temps, y=indicateurs['gini'], name='Gini'),
-        row=1, col=2
-    )
-    
-    # Mobilité ascendante
-    fig.add_trace(
-        go.Scatter(x=temps, y=indicateurs['mobilite_ascendante'], name='Mobilité'),
-        row=2, col=1
-    )
-    
-    # Revenu moyen global
-    fig.add_trace(
-        go.Scatter(x=temps, y=indicateurs['revenu_moyen_global'], name='Revenu moyen'),
-        row=2, col=2
-    )
-    
-    fig.update_layout(
-        title="Tableau de bord - Indicateurs clés",
-        template="plotly_white",
-        height=600,
-        showlegend=False
-    )
-    
-    return fig
+    return _figure(data=traces, layout=_DASHBOARD_LAYOUT)